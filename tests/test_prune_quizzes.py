@@ -0,0 +1,86 @@
+"""
+Tests for prune_quizzes.py quiz name extraction
+
+_frontmatter_name() decides which local quizzes exist; a name that differs
+from what yaml.safe_load (and so sync_quizzes) reads makes prune delete a
+live Canvas quiz, so every case is checked against PyYAML.
+"""
+import random
+
+import pytest
+import yaml
+
+from zaphod.prune_quizzes import _frontmatter_name
+
+
+def yaml_name(fm_text):
+    """Reference: the name as yaml.safe_load reads it (strings only)."""
+    fm = yaml.safe_load(fm_text)
+    name = fm.get("name") if isinstance(fm, dict) else None
+    return name if isinstance(name, str) and name else None
+
+
+class TestFrontmatterName:
+    """_frontmatter_name must agree with yaml.safe_load"""
+
+    @pytest.mark.parametrize("fm_text", [
+        "name: Quiz 1",
+        "title: Week 1\nname: Week 1 Quiz\npoints: 2",
+        "name:   spaced out   ",
+        "name: Café quiz",
+        "name: a:b",
+        "name: http://example.com/x",
+        "name: Plain # comment",
+        'name: "Quiz 1"  # note',
+        "name: 'Student''s quiz'",
+        'name: "A \\"B\\""',
+        "name: \"Tab\\there\"",
+        "name: null",
+        "name: ~",
+        "name: 2024",
+        "name: 1.5",
+        "name: 0x1F",
+        "name: .inf",
+        "name: yes",
+        "name: 2024-01-01",
+        "name: [a, b]",
+        "name: -x",
+        "name: first\nname: second",
+        "name: wrapped\n  onto two lines",
+        "name: wrapped\n\n  after a blank line",
+        "name: |\n  Block quiz\n",
+        "name: >\n  Folded\n  quiz\n",
+        '"name": quoted key',
+        "name : space before colon",
+        "title: no name here",
+    ])
+    def test_matches_yaml(self, fm_text):
+        """Known tricky values come out exactly as PyYAML reads them"""
+        assert _frontmatter_name(fm_text) == yaml_name(fm_text)
+
+    def test_non_string_names_are_missing(self):
+        """null, numbers and booleans do not count as a quiz name"""
+        for value in ("null", "2024", "true", "1.5"):
+            assert _frontmatter_name(f"name: {value}") is None
+
+    def test_fuzz_matches_yaml(self):
+        """Random values agree with PyYAML wherever PyYAML parses them"""
+        rng = random.Random(1234)
+        tokens = [
+            "a", "Q", " ", "  ", ":", "#", "'", '"', "\\", "-", "1", "2024",
+            "null", "true", "\t", "é", "[", "]", "{", "}", ",", "?", "!", "&",
+            "*", "|", ">", "%", "@", "`", ".", "~", "=", "0x", "e5", " :",
+        ]
+        prefixes = ["name: ", "title: x\nname: ", "name:", "name : ", "names: 1\nname: "]
+        suffixes = ["", "\nother: 1", "\n  cont", "\n\n  c", "\nname: z"]
+        checked = 0
+        for _ in range(5000):
+            value = "".join(rng.choice(tokens) for _ in range(rng.randint(1, 6)))
+            fm_text = rng.choice(prefixes) + value + rng.choice(suffixes)
+            try:
+                expected = yaml_name(fm_text)
+            except yaml.YAMLError:
+                continue
+            assert _frontmatter_name(fm_text) == expected, fm_text
+            checked += 1
+        assert checked > 1000
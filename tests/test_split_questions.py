@@ -0,0 +1,76 @@
+"""
+Tests for split_questions in sync_banks.py and sync_quizzes.py
+
+split_questions walks QUESTION_SPLIT_RE instead of tracking fence state
+line by line; these tests pin it to the previous line loop.
+"""
+import random
+
+import pytest
+
+from zaphod import sync_banks, sync_quizzes
+
+
+def reference_split_questions(raw):
+    """The line-by-line splitter split_questions replaced."""
+    blocks = []
+    cur = []
+    in_code_block = False
+
+    def push():
+        nonlocal cur
+        if cur and any(line.strip() for line in cur):
+            blocks.append(cur)
+        cur = []
+
+    for line in raw.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            in_code_block = not in_code_block
+            cur.append(line)
+        elif not line.strip() and not in_code_block:
+            push()
+        else:
+            cur.append(line)
+    push()
+    return blocks
+
+
+MODULES = [sync_banks, sync_quizzes]
+
+CASES = [
+    "",
+    "\n\n",
+    "1. What is 2+2?\na) 3\n*b) 4",
+    "1. First?\na) x\n*b) y\n\n2. Second?\n*a) True\nb) False\n",
+    "1. Code?\n```python\nx = 1\n\ny = 2\n```\n*a) yes\n\n2. Next",
+    "1. Tilde\n~~~\n\n\n~~~\n\n2. After",
+    "1. Unclosed\n```\n\n2. still code",
+    "   \n1. Leading blank\n \t \n2. Whitespace-only separator",
+    "1. CRLF\r\na) x\r\n\r\n2. Two\r\n",
+    "1. Mixed\ra) x\r\r2. Old Mac endings",
+    "  ```js\n1. indented fence\n\n  ```\n\n2. after",
+    "1. ```inline fence``` opens\n\nstill in block",
+]
+
+
+class TestSplitQuestions:
+    """split_questions must match the previous line loop"""
+
+    @pytest.mark.parametrize("module", MODULES, ids=lambda m: m.__name__)
+    @pytest.mark.parametrize("raw", CASES)
+    def test_known_cases(self, module, raw):
+        """Hand-picked quiz bodies split the same as before"""
+        assert module.split_questions(raw) == reference_split_questions(raw)
+
+    @pytest.mark.parametrize("module", MODULES, ids=lambda m: m.__name__)
+    def test_fuzz(self, module):
+        """Random bodies of fences, blanks and text split the same as before"""
+        rng = random.Random(2024)
+        pieces = [
+            "1. Q?", "a) x", "*b) y", "text", "```", "```py", "~~~", "  ```",
+            "", " ", "\t", "\r", "\r\n", "\n",
+        ]
+        for _ in range(3000):
+            raw = "\n".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            assert module.split_questions(raw) == reference_split_questions(raw), repr(raw)
@@ -0,0 +1,112 @@
+"""
+Tests for stem_to_html in sync_banks.py and sync_quizzes.py
+
+stem_to_html walks STEM_TOKEN_RE instead of looping over lines with fence
+state; these tests pin it to the previous line loop, including how each
+module renders an unclosed fence.
+"""
+import random
+
+import pytest
+
+from zaphod import sync_banks, sync_quizzes
+
+
+def reference_stem_to_html(stem, escape, unclosed_keeps_lang):
+    """The line-by-line renderer stem_to_html replaced."""
+    result_parts = []
+    current_para = []
+    in_code_block = False
+    code_block_lines = []
+    code_lang = ""
+
+    def code_block(lang):
+        code_content = escape("\n".join(code_block_lines))
+        if lang:
+            return f'<pre><code class="language-{escape(lang)}">{code_content}</code></pre>'
+        return f"<pre><code>{code_content}</code></pre>"
+
+    def flush_paragraph():
+        nonlocal current_para
+        if current_para:
+            text = " ".join(current_para)
+            parts = []
+            last_end = 0
+            for match in sync_banks.INLINE_CODE_RE.finditer(text):
+                parts.append(escape(text[last_end:match.start()]))
+                parts.append(f"<code>{escape(match.group(1))}</code>")
+                last_end = match.end()
+            parts.append(escape(text[last_end:]))
+            result_parts.append(f"<p>{''.join(parts)}</p>")
+            current_para = []
+
+    for line in stem.split("\n"):
+        stripped = line.strip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            if not in_code_block:
+                flush_paragraph()
+                in_code_block = True
+                code_lang = stripped[3:].strip()
+                code_block_lines = []
+            else:
+                in_code_block = False
+                result_parts.append(code_block(code_lang))
+                code_block_lines = []
+                code_lang = ""
+        elif in_code_block:
+            code_block_lines.append(line)
+        elif not stripped:
+            flush_paragraph()
+        else:
+            current_para.append(line)
+
+    flush_paragraph()
+    if in_code_block and code_block_lines:
+        result_parts.append(code_block(code_lang if unclosed_keeps_lang else ""))
+    return "\n".join(result_parts)
+
+
+# (module, its escape function, whether an unclosed fence keeps its language)
+MODULES = [
+    (sync_banks, sync_banks.escape_html_text, True),
+    (sync_quizzes, sync_quizzes.escape_html, False),
+]
+MODULE_IDS = ["sync_banks", "sync_quizzes"]
+
+CASES = [
+    "",
+    "What is 2+2?",
+    "Line one\nline two\n\nSecond paragraph",
+    "Use `print()` and <b> & \"quotes\"",
+    "Before\n```python\nx = 1 < 2\n\ny = 3\n```\nAfter",
+    "~~~\nplain code\n~~~",
+    "Unclosed\n```js\nlet a = 1;",
+    "Unclosed but empty\n```",
+    "  ```  sql  \nSELECT 1;\n  ```",
+    "Odd `backtick count` and ` lone",
+    "\n\n  \nTrailing blanks\n\n",
+    "Tabs\t\tand\r\ncarriage returns",
+]
+
+
+class TestStemToHtml:
+    """stem_to_html must match the previous line loop"""
+
+    @pytest.mark.parametrize("module,escape,keeps_lang", MODULES, ids=MODULE_IDS)
+    @pytest.mark.parametrize("stem", CASES)
+    def test_known_cases(self, module, escape, keeps_lang, stem):
+        """Hand-picked stems render the same as before"""
+        assert module.stem_to_html(stem) == reference_stem_to_html(stem, escape, keeps_lang)
+
+    @pytest.mark.parametrize("module,escape,keeps_lang", MODULES, ids=MODULE_IDS)
+    def test_fuzz(self, module, escape, keeps_lang):
+        """Random stems of fences, blanks and inline code render the same as before"""
+        rng = random.Random(4096)
+        pieces = [
+            "text", "a `b` c", "`", "<&>", "```", "```py", "~~~", "  ```  c ",
+            "", " ", "\t", "\r", "x\ty",
+        ]
+        for _ in range(3000):
+            stem = "\n".join(rng.choice(pieces) for _ in range(rng.randint(0, 10)))
+            expected = reference_stem_to_html(stem, escape, keeps_lang)
+            assert module.stem_to_html(stem) == expected, repr(stem)
@@ -8,8 +8,10 @@ SECURITY: Uses centralized credential loading from security_utils.py
 """
 
 import os
+import queue
+import threading
 from pathlib import Path
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Iterable, Iterator, Tuple, TypeVar
 
 # Lazy import - only load canvasapi when actually needed
 if TYPE_CHECKING:
@@ -22,6 +24,8 @@ from zaphod.security_utils import (
     mask_sensitive,
 )
 
+T = TypeVar("T")
+
 
 def get_canvas_credentials() -> Tuple[str, str]:
     """
@@ -87,3 +91,59 @@ def get_canvas_base_url() -> str:
     """
     api_url, _ = get_canvas_credentials()
     return api_url
+
+
+def prefetch_iter(iterable: Iterable[T], buffer: int = 100) -> Iterator[T]:
+    """
+    Iterate over `iterable` while a background thread pulls ahead.
+
+    Meant for canvasapi PaginatedList results: the next page's HTTP request
+    runs while the caller is still working through the current one.
+    Exceptions raised while fetching are re-raised in the caller.
+
+    Args:
+        iterable: Any iterable, typically a PaginatedList
+        buffer: Maximum number of items fetched ahead of the caller. Counted
+            in items, not pages: the default covers one full Canvas page
+            (per_page is at most 100), so page N+1 is requested while page
+            N is consumed. A buffer of 2 items would stall the fetcher
+            until the caller was nearly through each page.
+
+    Yields:
+        Items from `iterable`, in order
+    """
+    q: "queue.Queue[tuple]" = queue.Queue(maxsize=buffer)
+    stop = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+        except BaseException as e:
+            put((False, e))
+            return
+        put((False, None))
+
+    thread = threading.Thread(target=producer, name="canvas-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            ok, item = q.get()
+            if ok:
+                yield item
+            elif item is None:
+                return
+            else:
+                raise item
+    finally:
+        stop.set()
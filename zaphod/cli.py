@@ -257,8 +257,9 @@ def cli(ctx):
 @click.option('--assets-only', is_flag=True, help='Only upload assets, skip content')
 @click.option('--no-prune', is_flag=True, help='Skip cleanup/prune step')
 @click.option('--dry-run', '-n', is_flag=True, help='Preview changes without making them')
+@click.option('--refresh', is_flag=True, help='Re-check cached Canvas file URLs')
 @click.pass_obj
-def sync(ctx: ZaphodContext, watch: bool, course_id: Optional[int], assets_only: bool, no_prune: bool, dry_run: bool):
+def sync(ctx: ZaphodContext, watch: bool, course_id: Optional[int], assets_only: bool, no_prune: bool, dry_run: bool, refresh: bool):
     """
     Sync local content to Canvas
     
@@ -279,6 +280,7 @@ def sync(ctx: ZaphodContext, watch: bool, course_id: Optional[int], assets_only:
         zaphod sync --assets-only      # Only upload media files
         zaphod sync --no-prune         # Skip cleanup step
         zaphod sync --dry-run          # Preview what would happen
+        zaphod sync --refresh          # Re-upload files deleted in Canvas
     """
     if dry_run and watch:
         click.echo(f"{B_WARNING} --dry-run and --watch cannot be used together", err=True)
@@ -309,6 +311,7 @@ def sync(ctx: ZaphodContext, watch: bool, course_id: Optional[int], assets_only:
         
         # Build script commands with --dry-run where supported
         dry_flag = " --dry-run" if dry_run else ""
+        refresh_flag = " --refresh" if refresh else ""
         
         # Run the pipeline steps manually
         steps = [
@@ -316,10 +319,10 @@ def sync(ctx: ZaphodContext, watch: bool, course_id: Optional[int], assets_only:
         ]
         
         if assets_only:
-            steps.append(("publish_all.py --assets-only", f"{PACKAGE} Uploading assets"))
+            steps.append((f"publish_all.py --assets-only{refresh_flag}", f"{PACKAGE} Uploading assets"))
         else:
             steps.extend([
-                (f"publish_all.py{dry_flag}", f"{UPLOAD} Publishing content"),
+                (f"publish_all.py{dry_flag}{refresh_flag}", f"{UPLOAD} Publishing content"),
                 (f"sync_banks.py{dry_flag}", f"{BANK} Importing question banks"),  # Banks before quizzes
                 (f"sync_quizzes.py{dry_flag}", f"{QUIZ} Syncing quiz folders"),    # Quizzes before modules
             ])
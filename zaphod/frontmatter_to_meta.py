@@ -16,6 +16,7 @@ Features:
 """
 
 from pathlib import Path
+import functools
 import json
 import os
 import re
@@ -143,6 +144,34 @@ VAR_RE = re.compile(r"\{\{var:([a-zA-Z_][a-zA-Z0-9_-]*)\}\}")
 INCLUDE_RE = re.compile(r"\{\{include:([a-zA-Z_][a-zA-Z0-9_-]*)\}\}")
 
 
+class VarTemplate:
+    """
+    Text pre-split on {{var:key}} placeholders.
+
+    segments alternates literal text and variable keys
+    (literal, key, literal, ..., literal), so rendering is a single join
+    with no regex scan.
+    """
+
+    __slots__ = ("segments",)
+
+    def __init__(self, text: str):
+        self.segments = tuple(VAR_RE.split(text))
+
+    def render(self, metadata: dict) -> str:
+        """Substitute variables; unknown keys keep their placeholder."""
+        segments = self.segments
+        parts = [segments[0]]
+        for i in range(1, len(segments), 2):
+            key = segments[i]
+            if key in metadata:
+                parts.append(str(metadata[key]))
+            else:
+                parts.append("{{var:" + key + "}}")
+            parts.append(segments[i + 1])
+        return "".join(parts)
+
+
 # =============================================================================
 # Variables Loading
 # =============================================================================
@@ -250,13 +279,18 @@ def interpolate_body(body: str, metadata: dict) -> str:
     Replace {{var:key}} in the body with corresponding values from metadata.
     If a key is missing, leave the placeholder as-is.
     """
-    def replace(match):
-        key = match.group(1)
-        if key not in metadata:
-            return match.group(0)
-        return str(metadata[key])
+    return VarTemplate(body).render(metadata)
+
 
-    return VAR_RE.sub(replace, body)
+@functools.lru_cache(maxsize=None)
+def load_include_template(inc_path: Path) -> VarTemplate:
+    """
+    Read and pre-parse an include file once per run.
+
+    Shared includes (contact info, policies) are typically pulled into many
+    pages; each page then only renders the cached template.
+    """
+    return VarTemplate(inc_path.read_text(encoding="utf-8"))
 
 
 def interpolate_includes(body: str, folder: Path, metadata: dict) -> str:
@@ -272,9 +306,8 @@ def interpolate_includes(body: str, folder: Path, metadata: dict) -> str:
             print(f"⚠️ {folder.name}: include '{name}' not found")
             return match.group(0)
         try:
-            inc_content = inc_path.read_text(encoding="utf-8")
             # Apply {{var:...}} to the include content
-            inc_content = interpolate_body(inc_content, metadata)
+            inc_content = load_include_template(inc_path).render(metadata)
             # Recursively expand any {{include:...}} inside the include
             inc_content = interpolate_includes(inc_content, folder, metadata)
             return inc_content
@@ -15,6 +15,7 @@ All unicode characters are defined here once. Never edit unicode
 characters in other files - import from this module instead.
 """
 
+import time
 from dataclasses import dataclass
 
 
@@ -289,8 +290,7 @@ def fence(label: str = "") -> None:
         [14:23:45] Syncing Question Banks
 
     """
-    from datetime import datetime
-    ts = datetime.now().strftime("%H:%M:%S")
+    ts = time.strftime("%H:%M:%S")
     print("." * 70)
     if label:
         print(f"[{ts}] {label}")
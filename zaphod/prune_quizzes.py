@@ -19,12 +19,15 @@ Env:
     CANVAS_CREDENTIAL_FILE
     COURSE_ID
     ZAPHOD_PRUNE_APPLY          (optional; falsey => dry-run, otherwise apply)
+    ZAPHOD_VERBOSE              (optional; truthy => list all local names)
 """
 
 from __future__ import annotations
 
+import functools
 import json
 import os
+import re
 from pathlib import Path
 from typing import Dict, Any, Set
 
@@ -32,7 +35,7 @@ import yaml
 from canvasapi import Canvas
 
 from zaphod.config_utils import get_course_id
-from zaphod.canvas_client import make_canvas_api_obj
+from zaphod.canvas_client import make_canvas_api_obj, prefetch_iter
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 SHARED_ROOT = SCRIPT_DIR.parent
@@ -41,6 +44,20 @@ QUESTION_BANKS_DIR = COURSE_ROOT / "question-banks"
 CONTENT_DIR = COURSE_ROOT / "content"
 PAGES_DIR = COURSE_ROOT / "pages"  # Legacy fallback
 
+# Top-level "name: value" line in quiz frontmatter (tabs go to the YAML parser)
+FRONTMATTER_NAME_RE = re.compile(r"^name *: +(.+?) *$")
+
+# Values the line scan may return as-is: a plain YAML scalar with no quotes,
+# escapes, comments, or leading indicator characters
+PLAIN_NAME_RE = re.compile(r"^[^-?:,\[\]{}#&*!|>'\"%@`\s][^'\"\\#\t]*$")
+
+# Decides whether a plain scalar is a string or null/bool/number/date
+_YAML_RESOLVER = yaml.resolver.Resolver()
+YAML_STR_TAG = "tag:yaml.org,2002:str"
+
+# Frontmatter normally fits well inside this many bytes of index.md
+FRONTMATTER_HEAD_BYTES = 8192
+
 
 def get_content_dir() -> Path:
     """Get content directory, preferring content/ over pages/."""
@@ -56,6 +73,82 @@ def _truthy_env(name: str, default: bool = False) -> bool:
     return v.lower() in {"1", "true", "yes", "on"}
 
 
+def _iter_quiz_dirs(root: str):
+    """
+    Yield paths (as str) of *.quiz directories under root.
+
+    Walks top-down and prunes each .quiz folder from the walk, so quiz
+    folders themselves are never descended into.
+    """
+    for dirpath, dirnames, _ in os.walk(root):
+        subdirs = []
+        for name in dirnames:
+            if name.endswith(".quiz"):
+                yield os.path.join(dirpath, name)
+            else:
+                subdirs.append(name)
+        dirnames[:] = subdirs
+
+
+def _frontmatter_name(fm_text: str):
+    """
+    Extract the top-level `name` value from a frontmatter block.
+
+    The value becomes the Canvas quiz title (sync_quizzes reads it with
+    yaml.safe_load), so it must come out exactly as YAML reads it. A single
+    `name: value` line whose value is a plain scalar resolving to a string
+    is returned straight from a line scan; anything else (quotes, escapes,
+    comments, continuation lines, more than one line starting with
+    `name`, null/bool/number values)
+    goes through yaml.safe_load. Non-string names are treated as missing.
+    """
+    if "name" not in fm_text:
+        return None
+
+    lines = fm_text.splitlines()
+    candidates = [(i, line) for i, line in enumerate(lines) if line.startswith("name")]
+    if len(candidates) == 1 and (m := FRONTMATTER_NAME_RE.match(candidates[0][1])):
+        i = candidates[0][0]
+        value = m.group(1)
+        following = next((line for line in lines[i + 1:] if line.strip()), "")
+        if (
+            PLAIN_NAME_RE.match(value)
+            and ": " not in value
+            and not value.endswith(":")
+            and not following[:1].isspace()
+            and _YAML_RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == YAML_STR_TAG
+        ):
+            return value
+
+    fm = yaml.safe_load(fm_text)
+    if isinstance(fm, dict):
+        name = fm.get("name")
+        if isinstance(name, str):
+            return name or None
+    return None
+
+
+def _read_frontmatter_block(index_path: Path):
+    """
+    Return the raw frontmatter text of index_path, or None if it has none.
+
+    Only the first FRONTMATTER_HEAD_BYTES are read; the full file is read
+    only when the closing delimiter is not found in that window.
+    """
+    with open(index_path, "rb") as fh:
+        head = fh.read(FRONTMATTER_HEAD_BYTES)
+        if not head.startswith(b"---"):
+            return None
+        end_idx = head.find(b"\n---", 3)
+        if end_idx < 0 and len(head) == FRONTMATTER_HEAD_BYTES:
+            head += fh.read()
+            end_idx = head.find(b"\n---", 3)
+    if end_idx < 0:
+        return None
+    return head[3:end_idx].decode("utf-8", errors="replace")
+
+
+@functools.lru_cache(maxsize=1)
 def get_local_quiz_names() -> Set[str]:
     """
     Get quiz names from local .quiz/ folders by reading their meta.json or index.md.
@@ -63,22 +156,28 @@ def get_local_quiz_names() -> Set[str]:
     Searches for quiz content in:
     1. content/**/*.quiz/ directories (or pages/**/*.quiz/ for legacy)
     2. Reads name from meta.json or index.md frontmatter
+
+    The result is cached for the life of the process; callers must not
+    mutate the returned set.
     """
     names: Set[str] = set()
     content_dir = get_content_dir()
     if not content_dir.is_dir():
         return names
 
-    for quiz_path in content_dir.rglob("*.quiz"):
-        # Only process directories (quiz folders, not files)
-        if not quiz_path.is_dir():
-            continue
-        
-        quiz_folder = quiz_path
+    for quiz_dir in _iter_quiz_dirs(str(content_dir)):
+        quiz_folder = Path(quiz_dir)
+
+        # List the folder once; only open the files that are actually there
+        try:
+            with os.scandir(quiz_dir) as it:
+                file_names = {e.name for e in it if e.is_file()}
+        except OSError:
+            file_names = set()
         
         # Try meta.json first
         meta_path = quiz_folder / "meta.json"
-        if meta_path.exists():
+        if "meta.json" in file_names:
             try:
                 data = json.loads(meta_path.read_text(encoding="utf-8"))
                 name = data.get("name")
@@ -91,19 +190,15 @@ def get_local_quiz_names() -> Set[str]:
         
         # Fall back to index.md frontmatter
         index_path = quiz_folder / "index.md"
-        if index_path.exists():
+        if "index.md" in file_names:
             try:
-                content = index_path.read_text(encoding="utf-8")
-                if content.startswith("---"):
-                    end_idx = content.find("---", 3)
-                    if end_idx > 0:
-                        fm = yaml.safe_load(content[3:end_idx])
-                        if isinstance(fm, dict):
-                            name = fm.get("name")
-                            if name:
-                                names.add(name)
-                                print(f"[prune:quiz]   Found quiz '{name}' from {quiz_folder.relative_to(content_dir)}/index.md")
-                                continue
+                fm_text = _read_frontmatter_block(index_path)
+                if fm_text is not None:
+                    name = _frontmatter_name(fm_text)
+                    if name:
+                        names.add(name)
+                        print(f"[prune:quiz]   Found quiz '{name}' from {quiz_folder.relative_to(content_dir)}/index.md")
+                        continue
             except Exception:
                 pass
         
@@ -118,6 +213,7 @@ def get_local_quiz_names() -> Set[str]:
     return names
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_bank_names() -> Set[str]:
     """
     Get expected bank names from question-banks/*.bank.md and *.quiz.txt files.
@@ -128,13 +224,15 @@ def get_local_bank_names() -> Set[str]:
     if not QUESTION_BANKS_DIR.is_dir():
         return names
 
-    # New format: *.bank.md
-    for path in QUESTION_BANKS_DIR.glob("*.bank.md"):
-        names.add(path.stem)  # "chapter1.bank"
-    
-    # Legacy format: *.quiz.txt
-    for path in QUESTION_BANKS_DIR.glob("*.quiz.txt"):
-        names.add(path.stem)  # "week1.quiz"
+    with os.scandir(QUESTION_BANKS_DIR) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(".bank.md"):
+                # New format: "chapter1.bank.md" -> "chapter1.bank"
+                names.add(name[:-3])
+            elif name.endswith(".quiz.txt"):
+                # Legacy format: "week1.quiz.txt" -> "week1.quiz"
+                names.add(name[:-4])
     
     return names
 
@@ -144,12 +242,15 @@ def prune_orphan_quizzes(course, local_names: Set[str], apply: bool):
     Delete quizzes that don't have a corresponding local .quiz/ folder.
     """
     print("[prune:quiz] Checking for orphan quizzes...")
-    print(f"[prune:quiz] Local quiz names: {sorted(local_names)}")
+    if _truthy_env("ZAPHOD_VERBOSE"):
+        print(f"[prune:quiz] Local quiz names: {sorted(local_names)}")
+    else:
+        print(f"[prune:quiz] Local quiz names: {len(local_names)}")
     
     scanned = 0
     deleted = 0
 
-    for quiz in course.get_quizzes():
+    for quiz in prefetch_iter(course.get_quizzes()):
         scanned += 1
         
         if quiz.title in local_names:
@@ -170,14 +271,19 @@ def prune_stale_banks(course, local_names: Set[str], apply: bool):
     """
     Delete question banks whose names do not match any local bank file.
     """
-    print(f"[prune:banks] Local bank names: {sorted(local_names)}")
+    if _truthy_env("ZAPHOD_VERBOSE"):
+        print(f"[prune:banks] Local bank names: {sorted(local_names)}")
+    else:
+        print(f"[prune:banks] Local bank names: {len(local_names)}")
 
     if not local_names:
         print("[prune:banks] No local bank files; skipping bank prune.")
         return
 
     try:
-        banks = list(course.get_question_banks())
+        # List every bank before deleting any: deletes shift Canvas's
+        # page-number pagination and would skip banks on later pages
+        banks = list(prefetch_iter(course.get_question_banks()))
     except AttributeError:
         print("[prune:banks] course.get_question_banks() not available; skipping.")
         return
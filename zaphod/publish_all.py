@@ -15,9 +15,22 @@ No longer depends on markdown2canvas - uses canvasapi directly.
 from pathlib import Path
 import os
 import json
+import mmap
 import re
 import argparse
+import functools
 import hashlib
+import html
+import stat
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Zaphod modules
 from zaphod.canvas_client import make_canvas_api_obj, get_canvas_base_url
@@ -28,18 +41,27 @@ from zaphod.errors import (
     CanvasAPIError,
     SyncError,
 )
-from zaphod.security_utils import is_safe_path
 from zaphod.icons import SUCCESS, ERROR, fence
+from zaphod.security_utils import is_safe_path
 
 
 # Paths relative to course root (cwd)
 COURSE_ROOT = Path.cwd()
+COURSE_ROOT_PREFIX = os.path.join(str(COURSE_ROOT), "")
 CONTENT_DIR = COURSE_ROOT / "content"
 PAGES_DIR = COURSE_ROOT / "pages"  # Legacy fallback
 ASSETS_DIR = COURSE_ROOT / "assets"
+ASSETS_DIR_STR = str(ASSETS_DIR)
 METADATA_DIR = COURSE_ROOT / "_course_metadata"
 UPLOAD_CACHE_FILE = METADATA_DIR / "upload_cache.json"
 
+# Content hashes in upload cache keys are 64-bit BLAKE2b digests. The prefix
+# keeps them from matching keys written by older MD5-based versions.
+CACHE_HASH_PREFIX = "b2:"
+
+# Guards upload cache writes made from video upload worker threads
+_CACHE_LOCK = threading.Lock()
+
 
 # =============================================================================
 # Content Directory Resolution
@@ -60,6 +82,8 @@ def load_upload_cache() -> dict:
     """Load the cache of previously uploaded files."""
     if UPLOAD_CACHE_FILE.exists():
         try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(UPLOAD_CACHE_FILE.read_bytes())
             return json.loads(UPLOAD_CACHE_FILE.read_text())
         except Exception as e:
             print(f"⚠️ cache: Failed to load cache: {e}")
@@ -70,64 +94,162 @@ def save_upload_cache(cache: dict):
     """Save the upload cache to disk."""
     try:
         METADATA_DIR.mkdir(parents=True, exist_ok=True)
-        UPLOAD_CACHE_FILE.write_text(json.dumps(cache, indent=2))
+        if ORJSON_AVAILABLE:
+            UPLOAD_CACHE_FILE.write_bytes(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+        else:
+            UPLOAD_CACHE_FILE.write_text(json.dumps(cache, indent=2))
     except Exception as e:
         print(f"⚠️ cache: Failed to save cache: {e}")
 
 
+# Files at least this large are hashed through mmap instead of read()
+MMAP_HASH_THRESHOLD = 8 << 20
+
+
+def _new_cache_hash():
+    """Return a fresh hash object for upload cache fingerprints."""
+    return hashlib.blake2b(digest_size=8)
+
+
+def _hash_file(local_path: Path, new_hash=_new_cache_hash) -> str:
+    """
+    Hash a file without loading it into memory.
+
+    Files of MMAP_HASH_THRESHOLD bytes or more are memory-mapped and hashed
+    in one call, so the kernel pages them in while the C hasher runs.
+    Smaller files use hashlib.file_digest on Python 3.11+, otherwise
+    1 MiB chunks.
+    """
+    with open(local_path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size >= MMAP_HASH_THRESHOLD:
+            try:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h = new_hash()
+                    h.update(mm)
+                    return h.hexdigest()
+            except (OSError, ValueError):
+                pass  # mmap unsupported here (e.g. special files); stream instead
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(fh, new_hash).hexdigest()
+        h = new_hash()
+        while chunk := fh.read(1 << 20):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def get_content_hash(local_path: Path, cache: dict) -> str:
+    """
+    Return the short content hash used in upload cache keys.
+
+    The hash is remembered in the upload cache under "stat:<path>" together
+    with the file's mtime_ns and size, so unchanged files are not re-read
+    on every publish. On a miss the file is stream-hashed.
+    """
+    st = local_path.stat()
+    stat_key = f"stat:{local_path}"
+
+    entry = cache.get(stat_key)
+    if (
+        isinstance(entry, dict)
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and entry.get("size") == st.st_size
+        and str(entry.get("hash", "")).startswith(CACHE_HASH_PREFIX)
+    ):
+        return entry["hash"]
+
+    content_hash = CACHE_HASH_PREFIX + _hash_file(local_path)
+
+    with _CACHE_LOCK:
+        cache[stat_key] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "hash": content_hash,
+        }
+    return content_hash
+
+
 # =============================================================================
 # Changed files helpers (for incremental mode)
 # =============================================================================
 
-def get_changed_files() -> list[Path]:
+def get_changed_files() -> list[str]:
     """
-    Read ZAPHOD_CHANGED_FILES and return them as Path objects.
+    Read ZAPHOD_CHANGED_FILES and return them as path strings.
     Empty list if the env var is missing/empty.
     """
     raw = os.environ.get("ZAPHOD_CHANGED_FILES", "").strip()
     if not raw:
         return []
-    return [Path(p) for p in raw.splitlines() if p.strip()]
+    return [p for p in raw.splitlines() if p.strip()]
+
+
+# Publishable content folder extensions, in publish order
+CONTENT_EXTS = (".page", ".assignment", ".link", ".file")
+CONTENT_EXT_SET = frozenset(CONTENT_EXTS)
+
+
+def _scan_content_dirs(root: str, found: dict[str, list[str]]):
+    """
+    Collect content folders under root into `found`, keyed by extension.
+
+    Content folders are treated as leaves and not descended into.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(CONTENT_EXTS):
+                if entry.is_dir():
+                    found[os.path.splitext(name)[1]].append(entry.path)
+            elif entry.is_dir(follow_symlinks=False):
+                _scan_content_dirs(entry.path, found)
 
 
 def iter_all_content_dirs():
     """
     Yield every content folder under content/ (or pages/) ending in a known extension.
+
+    The tree is walked once; folders are yielded grouped by extension in
+    CONTENT_EXTS order.
     """
-    content_dir = get_content_dir()
-    for ext in [".page", ".assignment", ".link", ".file"]:
-        for folder in content_dir.rglob(f"*{ext}"):
-            yield folder
+    found: dict[str, list[str]] = {ext: [] for ext in CONTENT_EXTS}
+    _scan_content_dirs(str(get_content_dir()), found)
+    for ext in CONTENT_EXTS:
+        for folder in found[ext]:
+            yield Path(folder)
 
 
-def iter_changed_content_dirs(changed_files: list[Path]):
+def iter_changed_content_dirs(changed_files: list[str]):
     """
     From changed files, yield the content folders that should be published.
+
+    Works on plain strings; a Path is only built for folders that are yielded.
     """
-    exts = {".page", ".assignment", ".link", ".file"}
-    seen: set[Path] = set()
+    seen: set[str] = set()
 
-    for path in changed_files:
-        if path.name not in {"index.md", "source.md"}:
+    for path in map(os.fspath, changed_files):
+        folder, name = os.path.split(path)
+        if name not in {"index.md", "source.md"}:
             continue
 
-        try:
-            rel = path.relative_to(COURSE_ROOT)
-        except ValueError:
+        if not path.startswith(COURSE_ROOT_PREFIX):
             continue
+        rel = path[len(COURSE_ROOT_PREFIX):]
 
         # Must be under content/ or pages/
-        if not rel.parts or rel.parts[0] not in ("content", "pages"):
+        top = rel.split(os.sep, 1)[0]
+        if top not in ("content", "pages"):
             continue
 
-        folder = path.parent
-
-        if folder.suffix not in exts:
+        if os.path.splitext(folder)[1] not in CONTENT_EXT_SET:
             continue
 
         if folder not in seen:
             seen.add(folder)
-            yield folder
+            yield Path(folder)
 
 
 # =============================================================================
@@ -135,7 +257,44 @@ def iter_changed_content_dirs(changed_files: list[Path]):
 # =============================================================================
 
 # {{video:filename}} regex (with optional quotes)
-VIDEO_RE = re.compile(r"\{\{video:\s*\"?([^}\"]+?)\"?\s*\}\}")
+VIDEO_RE = re.compile(r"\{\{video:\s*\"?([^}\"]+?)\"?\s*\}\}", re.ASCII)
+
+# Canvas media iframe emitted for each {{video:...}} placeholder
+IFRAME_TMPL = (
+    '<iframe style="width: 640px; height: 360px; display: inline-block;" '
+    'title="Video player for {name}" '
+    'data-media-type="video" '
+    'data-zaphod-video="{token}" '
+    'src="{src}" '
+    'loading="lazy" '
+    'allowfullscreen="allowfullscreen" '
+    'allow="fullscreen" '
+    'frameborder="0"></iframe>'
+)
+
+
+# course.id -> {display_name or filename: File}, filled on first use
+_COURSE_FILES_INDEX: dict = {}
+_COURSE_FILES_LOCK = threading.Lock()
+
+
+def _load_course_files_index(course) -> dict:
+    """
+    Return a name -> File map of every file in the course.
+
+    Built from a single course.get_files() listing the first time it is
+    needed and reused for the rest of the run, instead of one search
+    request per video.
+    """
+    with _COURSE_FILES_LOCK:
+        index = _COURSE_FILES_INDEX.get(course.id)
+        if index is None:
+            index = {}
+            for f in course.get_files():
+                index.setdefault(f.display_name, f)
+                index.setdefault(f.filename, f)
+            _COURSE_FILES_INDEX[course.id] = index
+        return index
 
 
 def get_or_upload_video_file(course, folder: Path, filename: str, cache: dict):
@@ -156,7 +315,7 @@ def get_or_upload_video_file(course, folder: Path, filename: str, cache: dict):
     
     if local_path:
         # Use content hash for cache key (handles updates)
-        content_hash = hashlib.md5(local_path.read_bytes()).hexdigest()[:12]
+        content_hash = get_content_hash(local_path, cache)
         cache_key = f"{course.id}:{clean_name}:{content_hash}"
     else:
         # Fallback to name-only key if file not found locally
@@ -164,21 +323,24 @@ def get_or_upload_video_file(course, folder: Path, filename: str, cache: dict):
         content_hash = None
 
     # 1) Check cache first
-    if cache_key in cache:
+    file_id = cache.get(cache_key)
+    if file_id is not None:
         try:
-            file_id = cache[cache_key]
             return course.get_file(file_id)
         except Exception as e:
             print(f"⚠️ cache: Cached file {clean_name} (id={file_id}) not found, will re-upload: {e}")
-            del cache[cache_key]
+            _forget_file_url(course, file_id, cache)
+            with _CACHE_LOCK:
+                cache.pop(cache_key, None)
 
-    # 2) If no local file, search Canvas by name (legacy behavior)
+    # 2) If no local file, look it up by name in Canvas (legacy behavior)
     if not local_path:
         try:
-            for f in course.get_files(search_term=clean_name):
-                if f.display_name == clean_name or f.filename == clean_name:
+            f = _load_course_files_index(course).get(clean_name)
+            if f is not None:
+                with _CACHE_LOCK:
                     cache[cache_key] = f.id
-                    return f
+                return f
         except Exception as e:
             raise CanvasAPIError(
                 message="Failed to search for existing files in Canvas",
@@ -232,43 +394,58 @@ def get_or_upload_video_file(course, folder: Path, filename: str, cache: dict):
             context={"response": resp}
         )
 
-    cache[cache_key] = file_id
+    _remember_upload(course, cache_key, file_id, cache)
     print(f"[upload] Uploaded {clean_name} (id={file_id}, hash={content_hash})")
     return course.get_file(file_id)
 
 
+# Concurrent video lookups/uploads per page
+VIDEO_UPLOAD_WORKERS = 4
+
+
 def replace_video_placeholders(text: str, course, folder: Path, canvas_base_url: str, cache: dict) -> str:
     """
     Replace {{video:filename}} with Canvas media-attachment iframe.
     
     Includes data-zaphod-video attribute for round-trip preservation.
+
+    Each distinct video is resolved once, with cache misses uploaded
+    concurrently before the placeholders are substituted.
     """
+    raw_names = {m.group(1).strip() for m in VIDEO_RE.finditer(text)}
+    if not raw_names:
+        return text
+
+    files = {}
+    workers = min(VIDEO_UPLOAD_WORKERS, len(raw_names))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(get_or_upload_video_file, course, folder, raw, cache): raw
+            for raw in sorted(raw_names)
+        }
+        for future in as_completed(futures):
+            raw = futures[future]
+            try:
+                files[raw] = future.result()
+            except Exception as e:
+                print(f"[publish:warn] {folder.name}: video '{raw}': {e}")
+
+    # Canvas media iframe URL prefix (same for every placeholder)
+    src_prefix = f"{canvas_base_url}/media_attachments_iframe/"
+
     def replace(match):
         original_token = match.group(0)  # e.g., {{video:"intro.mp4"}}
         raw = match.group(1).strip()     # e.g., intro.mp4
         
-        try:
-            f = get_or_upload_video_file(course, folder, raw, cache)
-        except Exception as e:
-            print(f"[publish:warn] {folder.name}: video '{raw}': {e}")
-            return original_token  # Leave placeholder if upload fails
+        f = files.get(raw)
+        if f is None:
+            return original_token  # Leave placeholder if upload failed
 
-        # Canvas media iframe URL
-        src = f"{canvas_base_url}/media_attachments_iframe/{f.id}"
-        
         # Escape the original token for HTML attribute
-        escaped_token = original_token.replace('"', '&quot;')
-
-        return (
-            f'<iframe style="width: 640px; height: 360px; display: inline-block;" '
-            f'title="Video player for {f.display_name}" '
-            f'data-media-type="video" '
-            f'data-zaphod-video="{escaped_token}" '
-            f'src="{src}" '
-            f'loading="lazy" '
-            f'allowfullscreen="allowfullscreen" '
-            f'allow="fullscreen" '
-            f'frameborder="0"></iframe>'
+        escaped_token = html.escape(original_token, quote=True)
+
+        return IFRAME_TMPL.format(
+            name=f.display_name, token=escaped_token, src=f"{src_prefix}{f.id}"
         )
 
     return VIDEO_RE.sub(replace, text)
@@ -278,21 +455,27 @@ def replace_video_placeholders(text: str, course, folder: Path, canvas_base_url:
 # Local asset reference handling (images, PDFs, etc. in markdown)
 # =============================================================================
 
-# Patterns to match local file references in markdown
-# Markdown image: ![alt](path) or ![alt](path "title")
-MD_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)(?:\s+"[^"]*")?\)')
-
-# Markdown link: [text](path) or [text](path "title")  
-MD_LINK_RE = re.compile(r'\[([^\]]*)\]\(([^)\s]+)(?:\s+"[^"]*")?\)')
-
-# HTML img tag: <img src="path" ...>
-HTML_IMG_RE = re.compile(r'<img\s+[^>]*src=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
-
-# HTML anchor with href to local file: <a href="path" ...>
-HTML_LINK_RE = re.compile(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
+# Pattern to match local file references in markdown/HTML, one named
+# alternative per reference kind. The image branch must precede the link
+# branch so ![alt](path) is not consumed as a plain link.
+#
+# Bracket text excludes "[" as well as "]", so a run of unmatched "[" is
+# rejected at the next "[" instead of rescanning to the end of the text
+# from every one of them (possessive quantifiers need Python 3.11+).
+ASSET_REF_RE = re.compile(
+    # Markdown image: ![alt](path) or ![alt](path "title")
+    r'(?P<md_img>!\[(?P<img_alt>[^\[\]]*)\]\((?P<img_ref>[^)\s]+)(?:\s+"[^"]*")?\))'
+    # Markdown link: [text](path) or [text](path "title")
+    r'|(?P<md_link>\[(?P<link_text>[^\[\]]*)\]\((?P<link_ref>[^)\s]+)(?:\s+"[^"]*")?\))'
+    # HTML img tag: <img src="path" ...>
+    r'|(?P<html_img><img\s+[^>]*src=["\'](?P<img_src>[^"\']+)["\'][^>]*>)'
+    # HTML anchor with href to local file: <a href="path" ...>
+    r'|(?P<html_link><a\s+[^>]*href=["\'](?P<a_href>[^"\']+)["\'][^>]*>)',
+    re.IGNORECASE | re.ASCII,
+)
 
 # File extensions we consider local assets (not URLs)
-LOCAL_ASSET_EXTENSIONS = {
+LOCAL_ASSET_EXTENSIONS = frozenset({
     # Images
     '.png', '.jpg', '.jpeg', '.gif', '.svg', '.bmp', '.webp', '.ico', '.tiff',
     # Documents
@@ -307,7 +490,17 @@ LOCAL_ASSET_EXTENSIONS = {
     '.mp3', '.wav', '.ogg', '.m4a', '.flac',
     # Other
     '.json', '.xml', '.yaml', '.yml', '.html', '.htm',
-}
+})
+
+
+# Tuple form for a single str.endswith() call
+LOCAL_ASSET_EXT_TUPLE = tuple(sorted(LOCAL_ASSET_EXTENSIONS))
+
+# Cheap pre-filter: text with none of these extensions has no local assets
+_EXT_HINT_RE = re.compile(
+    "|".join(re.escape(ext) for ext in LOCAL_ASSET_EXT_TUPLE),
+    re.IGNORECASE,
+)
 
 
 def is_local_asset_reference(path_str: str) -> bool:
@@ -327,8 +520,48 @@ def is_local_asset_reference(path_str: str) -> bool:
         return False
     
     # Check if it has a recognized asset extension
-    path_lower = path_str.lower()
-    return any(path_lower.endswith(ext) for ext in LOCAL_ASSET_EXTENSIONS)
+    return path_str.lower().endswith(LOCAL_ASSET_EXT_TUPLE)
+
+
+def _scandir_recursive(path: str):
+    """
+    Recursively yield os.DirEntry objects for files under path.
+
+    Relies on the DirEntry type cache instead of a stat() per entry.
+    Symlinked files are yielded (as rglob + is_file() did), but symlinked
+    directories are not descended into, so link loops cannot recurse;
+    unreadable directories are skipped.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path)
+                elif entry.is_file():
+                    yield entry
+    except PermissionError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _build_asset_index() -> dict[str, list[Path]]:
+    """
+    Map each filename under assets/ to every path where it occurs.
+
+    Built with one walk of assets/ per run and used by find_local_asset's
+    auto-discovery step instead of an rglob per reference.
+    """
+    index: dict[str, list[Path]] = {}
+    if ASSETS_DIR.exists():
+        for entry in _scandir_recursive(str(ASSETS_DIR)):
+            index.setdefault(entry.name, []).append(Path(entry.path))
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def _folder_within_course(folder_str: str) -> bool:
+    """Return True if a content folder resolves inside the course (memoized)."""
+    return is_safe_path(COURSE_ROOT, folder_str)
 
 
 def find_local_asset(folder: Path, filename: str) -> Path | None:
@@ -347,45 +580,57 @@ def find_local_asset(folder: Path, filename: str) -> Path | None:
     
     Returns the Path if found (unambiguously), None otherwise.
     """
-    clean_name = Path(filename).name
+    clean_name = os.path.basename(filename)
+    folder_str = os.fspath(folder)
     
     # 1. Check content folder for exact filename
-    local_path = folder / clean_name
-    if local_path.is_file():
+    #    One lstat() tells a plain file from a symlink. A plain file is safe
+    #    once its folder is known to be inside the course; a symlink (e.g.
+    #    into assets/) must itself resolve inside the course.
+    local_path = os.path.join(folder_str, clean_name)
+    try:
+        st = os.lstat(local_path)
+    except OSError:
+        st = None
+    if st is not None and stat.S_ISREG(st.st_mode):
         # SECURITY: Validate path is within course directory
+        if _folder_within_course(folder_str):
+            return Path(local_path)
+        print(f"[assets:SECURITY] Blocked path traversal: {filename}")
+        return None
+    if st is not None and stat.S_ISLNK(st.st_mode) and os.path.isfile(local_path):
+        # SECURITY: Validate symlink target is within course directory
         if is_safe_path(COURSE_ROOT, local_path):
-            return local_path
-        else:
-            print(f"[assets:SECURITY] Blocked path traversal: {filename}")
-            return None
+            return Path(local_path)
+        print(f"[assets:SECURITY] Blocked symlink outside course: {filename}")
+        return None
     
     # 2. Try explicit relative path from content folder, resolved
     #    This handles ../assets/images/logo.png correctly
-    relative_path = (folder / filename).resolve()
-    if relative_path.is_file():
+    relative_path = os.path.realpath(os.path.join(folder_str, filename))
+    if os.path.isfile(relative_path):
         # SECURITY: Validate resolved path is within course directory
         if is_safe_path(COURSE_ROOT, relative_path):
-            return relative_path
+            return Path(relative_path)
         else:
             print(f"[assets:SECURITY] Blocked path traversal: {filename}")
             print(f"[assets:SECURITY] Resolved path {relative_path} is outside course directory")
             return None
     
     # 3. Try path relative to assets/ directory (e.g., images/logo.png)
-    if ASSETS_DIR.exists():
-        asset_relative = ASSETS_DIR / filename
-        if asset_relative.is_file():
+    if os.path.exists(ASSETS_DIR_STR):
+        asset_relative = os.path.join(ASSETS_DIR_STR, filename)
+        if os.path.isfile(asset_relative):
             # SECURITY: Validate path is within assets directory
             if is_safe_path(ASSETS_DIR, asset_relative):
-                return asset_relative
+                return Path(asset_relative)
             else:
                 print(f"[assets:SECURITY] Blocked path traversal: {filename}")
                 return None
         
         # 4. Auto-discover: search all subfolders for filename match
         #    But only if we haven't already found it via explicit path
-        matches = list(ASSETS_DIR.rglob(clean_name))
-        matches = [m for m in matches if m.is_file()]
+        matches = _build_asset_index().get(clean_name, [])
         
         if len(matches) == 1:
             return matches[0]
@@ -401,6 +646,13 @@ def find_local_asset(folder: Path, filename: str) -> Path | None:
     return None
 
 
+# Per-run memo of asset URLs, so each file is hashed/uploaded at most once:
+# (course id, resolved folder, reference) -> URL and (course id, resolved file) -> URL.
+# replace_local_asset_references reads the per-reference memo directly.
+_asset_url_cache: dict[tuple[int, str, str], str] = {}
+_asset_url_by_path: dict[tuple[int, str], str] = {}
+
+
 def get_or_upload_local_asset(course, folder: Path, filename: str, cache: dict) -> str | None:
     """
     Upload a local asset to Canvas and return its download URL.
@@ -408,33 +660,119 @@ def get_or_upload_local_asset(course, folder: Path, filename: str, cache: dict)
     Uses content hash in cache key to handle:
     - Same filename in different locations (assets/ vs page folder)
     - Updated files with the same name
+
+    Results are memoized for the rest of the run, both per reference and
+    per resolved file, so pages sharing an asset only hash it once.
     
     Returns:
         Canvas file download URL, or None if file not found/upload failed
     """
+    ref_key = (course.id, str(folder.resolve()), filename)
+    url = _asset_url_cache.get(ref_key)
+    if url is not None:
+        return url
+
     # Find the local file
     local_path = find_local_asset(folder, filename)
     if not local_path:
         print(f"[assets:warn] Local asset not found: {filename}")
         return None
-    
+
+    path_key = (course.id, str(local_path.resolve()))
+    url = _asset_url_by_path.get(path_key)
+    if url is None:
+        url = _upload_local_asset(course, local_path, cache)
+        if url is None:
+            return None
+        _asset_url_by_path[path_key] = url
+
+    _asset_url_cache[ref_key] = url
+    return url
+
+
+def _file_url_key(course, file_id: int) -> str:
+    return f"url:{course.id}:{file_id}"
+
+
+def _forget_file_url(course, file_id: int, cache: dict) -> None:
+    """Drop the cached download URL of a file that is gone or replaced."""
+    with _CACHE_LOCK:
+        cache.pop(_file_url_key(course, file_id), None)
+
+
+def _remember_upload(course, cache_key: str, file_id: int, cache: dict) -> None:
+    """
+    Record a fresh upload under cache_key.
+
+    Any cached URL for the file id previously stored there, or for the new
+    id, is dropped so it is fetched again from Canvas.
+    """
+    with _CACHE_LOCK:
+        old_id = cache.get(cache_key)
+        cache[cache_key] = file_id
+        cache.pop(_file_url_key(course, file_id), None)
+        if old_id is not None:
+            cache.pop(_file_url_key(course, old_id), None)
+
+
+def drop_cached_file_urls(cache: dict) -> int:
+    """
+    Remove every cached download URL (publish_all --refresh).
+
+    The next lookup of each file then goes back to Canvas, so files deleted
+    there are detected and uploaded again. Returns the number removed.
+    """
+    with _CACHE_LOCK:
+        stale = [key for key in cache if key.startswith("url:")]
+        for key in stale:
+            del cache[key]
+    # The per-run memos hold URLs taken from those entries
+    _asset_url_cache.clear()
+    _asset_url_by_path.clear()
+    return len(stale)
+
+
+def _get_file_url(course, file_id: int, cache: dict) -> str:
+    """
+    Return the download URL of a Canvas file.
+
+    URLs are remembered in the upload cache under "url:<course>:<file_id>",
+    so unchanged assets cost no get_file() round-trip on later publishes.
+    The entry is dropped whenever Canvas reports the file missing or it is
+    re-uploaded, and --refresh drops them all.
+    """
+    url_key = _file_url_key(course, file_id)
+    url = cache.get(url_key)
+    if url is None:
+        url = course.get_file(file_id).url
+        with _CACHE_LOCK:
+            cache[url_key] = url
+    return url
+
+
+def _upload_local_asset(course, local_path: Path, cache: dict) -> str | None:
+    """
+    Return the Canvas download URL for local_path, uploading it if the
+    upload cache has no entry for its current content.
+    """
     actual_filename = local_path.name
     
     # Use content hash to uniquely identify files
     # This handles same filename in different locations + file updates
-    content_hash = hashlib.md5(local_path.read_bytes()).hexdigest()[:12]
+    content_hash = get_content_hash(local_path, cache)
     cache_key = f"{course.id}:{actual_filename}:{content_hash}"
     
     # Check cache first
     if cache_key in cache:
         try:
             file_id = cache[cache_key]
-            canvas_file = course.get_file(file_id)
             # Return the download URL
-            return canvas_file.url
+            return _get_file_url(course, file_id, cache)
         except Exception as e:
             print(f"[assets:warn] Cached file {actual_filename} not found, re-uploading: {e}")
-            del cache[cache_key]
+            _forget_file_url(course, file_id, cache)
+            with _CACHE_LOCK:
+                cache.pop(cache_key, None)
     
     # Note: We skip searching Canvas by filename since content hash means
     # we want this specific version of the file. If hash changed, re-upload.
@@ -452,10 +790,10 @@ def get_or_upload_local_asset(course, folder: Path, filename: str, cache: dict)
             print(f"[assets:err] No file ID returned for {actual_filename}")
             return None
         
-        cache[cache_key] = file_id
-        canvas_file = course.get_file(file_id)
+        _remember_upload(course, cache_key, file_id, cache)
+        url = _get_file_url(course, file_id, cache)
         print(f"[assets] Uploaded {actual_filename} (id={file_id}, hash={content_hash})")
-        return canvas_file.url
+        return url
         
     except Exception as e:
         print(f"[assets:err] Error uploading {actual_filename}: {e}")
@@ -477,69 +815,53 @@ def replace_local_asset_references(text: str, course, folder: Path, cache: dict)
     - Have recognized asset extensions
     - Can be found locally (in folder or assets/)
     """
-    # Track which files we've processed to avoid duplicate uploads
-    processed_files: dict[str, str] = {}  # original_ref -> canvas_url
-    
+    if not _EXT_HINT_RE.search(text):
+        return text
+
+    # Same key as get_or_upload_local_asset's per-reference memo, so refs
+    # already rewritten on earlier pages skip the asset checks entirely
+    folder_key = str(folder.resolve())
+
     def get_canvas_url(original_ref: str) -> str | None:
         """Get Canvas URL for a reference, using cache to avoid re-processing."""
-        if original_ref in processed_files:
-            return processed_files[original_ref]
+        canvas_url = _asset_url_cache.get((course.id, folder_key, original_ref))
+        if canvas_url is not None:
+            return canvas_url
         
         if not is_local_asset_reference(original_ref):
             return None
         
-        canvas_url = get_or_upload_local_asset(course, folder, original_ref, cache)
-        if canvas_url:
-            processed_files[original_ref] = canvas_url
-        return canvas_url
-    
-    # Process markdown images: ![alt](path)
-    def replace_md_image(match):
-        alt_text = match.group(1)
-        file_ref = match.group(2)
-        
-        canvas_url = get_canvas_url(file_ref)
-        if canvas_url:
-            return f'![{alt_text}]({canvas_url})'
-        return match.group(0)  # Keep original if not found
-    
-    text = MD_IMAGE_RE.sub(replace_md_image, text)
-    
-    # Process markdown links: [text](path) - only for asset files
-    def replace_md_link(match):
-        link_text = match.group(1)
-        file_ref = match.group(2)
-        
-        canvas_url = get_canvas_url(file_ref)
-        if canvas_url:
-            return f'[{link_text}]({canvas_url})'
-        return match.group(0)
+        return get_or_upload_local_asset(course, folder, original_ref, cache)
     
-    text = MD_LINK_RE.sub(replace_md_link, text)
-    
-    # Process HTML img tags: <img src="path">
-    def replace_html_img(match):
+    def replace(match):
+        kind = match.lastgroup
+
+        # Markdown image: ![alt](path)
+        if kind == "md_img":
+            canvas_url = get_canvas_url(match.group("img_ref"))
+            if canvas_url:
+                return f'![{match.group("img_alt")}]({canvas_url})'
+            return match.group(0)  # Keep original if not found
+
+        # Markdown link: [text](path) - only for asset files
+        if kind == "md_link":
+            canvas_url = get_canvas_url(match.group("link_ref"))
+            if canvas_url:
+                return f'[{match.group("link_text")}]({canvas_url})'
+            return match.group(0)
+
+        # HTML img tag <img src="path"> or anchor <a href="path">
         full_tag = match.group(0)
-        file_ref = match.group(1)
-        
-        canvas_url = get_canvas_url(file_ref)
+        group = "img_src" if kind == "html_img" else "a_href"
+        canvas_url = get_canvas_url(match.group(group))
         if canvas_url:
-            return full_tag.replace(file_ref, canvas_url)
+            # Splice at the attribute's span so only that value is rewritten
+            start, end = match.span(group)
+            offset = match.start()
+            return full_tag[:start - offset] + canvas_url + full_tag[end - offset:]
         return full_tag
-    
-    text = HTML_IMG_RE.sub(replace_html_img, text)
-    
-    # Process HTML anchor tags: <a href="path"> - only for asset files
-    def replace_html_link(match):
-        full_tag = match.group(0)
-        file_ref = match.group(1)
-        
-        canvas_url = get_canvas_url(file_ref)
-        if canvas_url:
-            return full_tag.replace(file_ref, canvas_url)
-        return full_tag
-    
-    text = HTML_LINK_RE.sub(replace_html_link, text)
+
+    text = ASSET_REF_RE.sub(replace, text)
     
     return text
 
@@ -548,63 +870,75 @@ def replace_local_asset_references(text: str, course, folder: Path, cache: dict)
 # Asset bulk upload
 # =============================================================================
 
+# File extensions picked up by --assets-only bulk upload
+BULK_ASSET_EXTENSIONS = frozenset({
+    # Videos
+    '.mp4', '.mov', '.avi', '.webm', '.mkv', '.m4v', '.flv', '.wmv',
+    # Images
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.bmp', '.webp', '.ico', '.tiff',
+    # Documents
+    '.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt',
+    # Archives
+    '.zip', '.tar', '.gz', '.rar', '.7z',
+    # Spreadsheets
+    '.xls', '.xlsx', '.csv', '.ods',
+    # Presentations
+    '.ppt', '.pptx', '.odp',
+    # Audio
+    '.mp3', '.wav', '.ogg', '.m4a', '.flac',
+    # Other
+    '.json', '.xml', '.yaml', '.yml',
+})
+
+# OS/tooling droppings never uploaded: exact names, and Windows
+# alternate-data-stream copies like "photo.png:Zone.Identifier"
+BULK_EXCLUDE_NAMES = frozenset({'.DS_Store', 'Thumbs.db', '.gitkeep'})
+BULK_EXCLUDE_SUFFIXES = (':Zone.Identifier',)
+
+
 def find_all_asset_files() -> list[Path]:
     """Find all uploadable asset files in the assets directory."""
     if not ASSETS_DIR.exists():
         return []
 
-    asset_extensions = {
-        # Videos
-        '.mp4', '.mov', '.avi', '.webm', '.mkv', '.m4v', '.flv', '.wmv',
-        # Images
-        '.jpg', '.jpeg', '.png', '.gif', '.svg', '.bmp', '.webp', '.ico', '.tiff',
-        # Documents
-        '.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt',
-        # Archives
-        '.zip', '.tar', '.gz', '.rar', '.7z',
-        # Spreadsheets
-        '.xls', '.xlsx', '.csv', '.ods',
-        # Presentations
-        '.ppt', '.pptx', '.odp',
-        # Audio
-        '.mp3', '.wav', '.ogg', '.m4a', '.flac',
-        # Other
-        '.json', '.xml', '.yaml', '.yml'
-    }
-
-    exclude_patterns = {
-        ':Zone.Identifier', '.DS_Store', 'Thumbs.db', '.gitkeep',
-    }
-
     asset_files = []
-    for file_path in ASSETS_DIR.rglob('*'):
-        if not file_path.is_file():
-            continue
-        if any(pattern in file_path.name for pattern in exclude_patterns):
+    for entry in _scandir_recursive(str(ASSETS_DIR)):
+        name = entry.name
+        if name in BULK_EXCLUDE_NAMES or name.endswith(BULK_EXCLUDE_SUFFIXES):
             continue
-        if file_path.suffix.lower() in asset_extensions:
-            asset_files.append(file_path)
+        if os.path.splitext(name)[1].lower() in BULK_ASSET_EXTENSIONS:
+            asset_files.append(Path(entry.path))
 
     return asset_files
 
 
-def upload_file_to_canvas(course, file_path: Path, cache: dict):
-    """Upload a file to Canvas, using content-hash cache to avoid re-uploads."""
+def upload_file_to_canvas(course, file_path: Path, cache: dict, content_hash: str | None = None):
+    """
+    Upload a file to Canvas, using content-hash cache to avoid re-uploads.
+
+    Pass `content_hash` when the caller has already hashed the file to
+    avoid reading it a second time. Otherwise the hash comes from
+    get_content_hash(), which skips re-reading files whose size and mtime
+    are unchanged.
+    """
     filename = file_path.name
     
     if not file_path.is_file():
         raise FileNotFoundError(f"File not found: {file_path}")
     
     # Use content hash for cache key
-    content_hash = hashlib.md5(file_path.read_bytes()).hexdigest()[:12]
+    if content_hash is None:
+        content_hash = get_content_hash(file_path, cache)
     cache_key = f"{course.id}:{filename}:{content_hash}"
 
-    if cache_key in cache:
+    file_id = cache.get(cache_key)
+    if file_id is not None:
         try:
-            file_id = cache[cache_key]
             return course.get_file(file_id)
         except Exception:
-            del cache[cache_key]
+            _forget_file_url(course, file_id, cache)
+            with _CACHE_LOCK:
+                cache.pop(cache_key, None)
 
     print(f"[upload] Uploading {filename}...")
     success, resp = course.upload(str(file_path))
@@ -615,25 +949,56 @@ def upload_file_to_canvas(course, file_path: Path, cache: dict):
     if not file_id:
         raise RuntimeError(f"No file id in upload response for {file_path}")
 
-    cache[cache_key] = file_id
+    _remember_upload(course, cache_key, file_id, cache)
     print(f"[upload] Uploaded {filename} (id={file_id}, hash={content_hash})")
     return course.get_file(file_id)
 
 
+# Concurrent hash/upload workers for bulk asset uploads
+BULK_UPLOAD_WORKERS = 8
+
+# cache_key -> lock serialising the check-and-upload for that key
+_bulk_upload_locks: dict[str, threading.Lock] = {}
+
+
+def _bulk_upload_one(course, file_path: Path, cache: dict) -> bool:
+    """
+    Hash one asset and upload it unless already cached.
+
+    Returns True if the file was uploaded, False if it was a cache hit.
+    """
+    content_hash = get_content_hash(file_path, cache)
+    cache_key = f"{course.id}:{file_path.name}:{content_hash}"
+    # Same-named files with the same content share a cache key; holding its
+    # lock across check and upload makes the second one a cache hit
+    with _CACHE_LOCK:
+        key_lock = _bulk_upload_locks.setdefault(cache_key, threading.Lock())
+    with key_lock:
+        if cache_key in cache:
+            return False
+
+        upload_file_to_canvas(course, file_path, cache, content_hash=content_hash)
+        return True
+
+
 def bulk_upload_assets(course, cache: dict):
-    """Bulk upload all asset files."""
+    """
+    Bulk upload all asset files.
+
+    Files are hashed and uploaded on a thread pool so network round-trips
+    overlap; progress is printed as each file completes.
+    """
     fence("Uploading Assets")
 
-    asset_files = find_all_asset_files()
+    asset_files = sorted(find_all_asset_files())
     if not asset_files:
         print("No asset files found in assets/ directory.")
         return
 
-    # Group by extension for reporting
-    file_types = {}
+    # Group by extension for reporting (one suffix lookup per file)
+    file_types = defaultdict(list)
     for file_path in asset_files:
-        ext = file_path.suffix.lower()
-        file_types.setdefault(ext, []).append(file_path)
+        file_types[file_path.suffix.lower()].append(file_path)
 
     print(f"Found {len(asset_files)} asset file(s):")
     for ext, files in sorted(file_types.items()):
@@ -642,22 +1007,22 @@ def bulk_upload_assets(course, cache: dict):
 
     uploaded = skipped = failed = 0
 
-    for file_path in sorted(asset_files):
-        filename = file_path.name
-        try:
-            # Use content hash for cache check
-            content_hash = hashlib.md5(file_path.read_bytes()).hexdigest()[:12]
-            cache_key = f"{course.id}:{filename}:{content_hash}"
-            if cache_key in cache:
-                print(f"{SUCCESS} {filename} (cached)")
-                skipped += 1
-                continue
-
-            upload_file_to_canvas(course, file_path, cache)
-            uploaded += 1
-        except Exception as e:
-            failed += 1
-            print(f"[bulk-upload]  {ERROR}  {filename}: {type(e).__name__}: {e}")
+    with ThreadPoolExecutor(max_workers=BULK_UPLOAD_WORKERS) as pool:
+        futures = {
+            pool.submit(_bulk_upload_one, course, file_path, cache): file_path
+            for file_path in asset_files
+        }
+        for future in as_completed(futures):
+            filename = futures[future].name
+            try:
+                if future.result():
+                    uploaded += 1
+                else:
+                    print(f"{SUCCESS} {filename} (cached)")
+                    skipped += 1
+            except Exception as e:
+                failed += 1
+                print(f"[bulk-upload]  {ERROR}  {filename}: {type(e).__name__}: {e}")
 
     fence("Assets Summary")
     print(f"{SUCCESS} Uploaded: {uploaded}, Skipped: {skipped}, Failed: {failed}")
@@ -680,6 +1045,11 @@ def main():
         action="store_true",
         help="Preview what would be published without making changes"
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-check cached Canvas file URLs and re-upload files deleted in Canvas"
+    )
     args = parser.parse_args()
 
     content_dir = get_content_dir()
@@ -705,6 +1075,9 @@ def main():
 
     # Load upload cache
     cache = load_upload_cache()
+    if args.refresh:
+        dropped = drop_cached_file_urls(cache)
+        print(f"Refreshing {dropped} cached file URL(s) from Canvas")
 
     # Handle assets-only mode
     if args.assets_only:
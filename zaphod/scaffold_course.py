@@ -19,309 +19,415 @@ Seeds example content with index.md and frontmatter.
 Does not touch existing files unless --force is specified.
 """
 
-from __future__ import annotations
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-import argparse
-from pathlib import Path
-import textwrap
-
-
-COURSE_ROOT = Path.cwd()
 
+# Folders are relative to the course root, which main() takes from the
+# current directory at run time (not at import)
 # NEW: Use content/ instead of pages/
-CONTENT_DIR = COURSE_ROOT / "content"
-SHARED_DIR = COURSE_ROOT / "shared"
-MODULES_DIR = COURSE_ROOT / "modules"
-OUTCOMES_DIR = COURSE_ROOT / "outcomes"
-QUESTION_BANKS_DIR = COURSE_ROOT / "question-banks"
-ASSETS_DIR = COURSE_ROOT / "assets"
-METADATA_DIR = COURSE_ROOT / "_course_metadata"
-RUBRICS_DIR = COURSE_ROOT / "rubrics"
-RUBRIC_ROWS_DIR = RUBRICS_DIR / "rows"
+CONTENT_DIR = "content"
+LEGACY_CONTENT_DIR = "pages"
+SHARED_DIR = "shared"
+MODULES_DIR = "modules"
+OUTCOMES_DIR = "outcomes"
+QUESTION_BANKS_DIR = "question-banks"
+ASSETS_DIR = "assets"
+METADATA_DIR = "_course_metadata"
+RUBRICS_DIR = "rubrics"
+RUBRIC_ROWS_DIR = os.path.join(RUBRICS_DIR, "rows")
+
+# Fixed directories to create (the content folder depends on --legacy).
+# Deepest first: makedirs() on rubrics/rows also creates rubrics/, which
+# ensure_dir() then already knows about.
+SCAFFOLD_DIRS = tuple(sorted(
+    (
+        SHARED_DIR,
+        MODULES_DIR,
+        OUTCOMES_DIR,
+        QUESTION_BANKS_DIR,
+        ASSETS_DIR,
+        METADATA_DIR,
+        RUBRICS_DIR,
+        RUBRIC_ROWS_DIR,
+    ),
+    key=lambda p: -p.count(os.sep),
+))
+
 
+# Concurrent writers for the sample files (helps on network filesystems)
+SCAFFOLD_WRITE_WORKERS = 8
 
-def ensure_dir(path: Path) -> None:
-    path.mkdir(parents=True, exist_ok=True)
+# Directories already created (or known to exist) during this run
+_CREATED_DIRS: set[str] = set()
 
 
-def write_file(path: Path, content: str, force: bool = False) -> None:
-    if path.exists() and not force:
-        print(f"[scaffold] SKIP existing file: {path.relative_to(COURSE_ROOT)}")
+def ensure_dir(course_root: str, rel: str) -> None:
+    """Create course_root/rel (and any missing parents) unless already done."""
+    path = os.path.join(course_root, rel)
+    if path in _CREATED_DIRS:
         return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
-    print(f"[scaffold] WROTE {path.relative_to(COURSE_ROOT)}")
+    os.makedirs(path, exist_ok=True)
+    # makedirs() also made every ancestor; remember them too
+    _CREATED_DIRS.add(path)
+    rel = os.path.dirname(rel)
+    while rel:
+        path = os.path.join(course_root, rel)
+        if path in _CREATED_DIRS:
+            break
+        _CREATED_DIRS.add(path)
+        rel = os.path.dirname(rel)
+
+
+def write_file(course_root: str, rel: str, content: bytes, force: bool = False) -> str:
+    """
+    Write course_root/rel and return its log line.
+
+    Safe to call from several threads; main() prints the returned lines in
+    manifest order.
+    """
+    path = os.path.join(course_root, rel)
+    if os.path.dirname(path) not in _CREATED_DIRS:
+        ensure_dir(course_root, os.path.dirname(rel))
+    # O_EXCL makes the existence check and the create a single syscall
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_TRUNC if force else os.O_EXCL
+    try:
+        fd = os.open(path, flags, 0o666)
+    except FileExistsError:
+        return f"[scaffold] SKIP existing file: {rel}"
+    # Write straight to the descriptor; a buffered wrapper would only add
+    # a copy for contents this small
+    try:
+        view = memoryview(content)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return f"[scaffold] WROTE {rel}"
 
 
 # =============================================================================
 # Sample Content
 # =============================================================================
 
-WELCOME_PAGE = textwrap.dedent(
-    """\
-    ---
-    type: page
-    name: Welcome
-    modules:
-      - Start Here
-    indent: 0
-    ---
-    
-    # Welcome to {{var:course_code}}
-    
-    Welcome to **{{var:course_title}}**, taught by {{var:instructor_name}}.
-    
-    This is your first Zaphod-managed Canvas page.
-    
-    ## Contact Information
-    
-    {{include:contact_info}}
-    
-    ## Getting Help
-    
-    If you have questions, please email {{var:instructor_email}}.
-    """
-)
-
-SAMPLE_ASSIGNMENT = textwrap.dedent(
-    """\
-    ---
-    type: assignment
-    name: Sample Assignment
-    points_possible: 10
-    submission_types:
-      - online_upload
-    modules:
-      - Week 1
-    indent: 0
-    ---
-    
-    # Sample Assignment
-    
-    Replace this content with your own assignment instructions.
-    
-    ## Late Policy
-    
-    {{include:late_policy}}
-    """
-)
+WELCOME_PAGE = """\
+---
+type: page
+name: Welcome
+modules:
+  - Start Here
+indent: 0
+---
+
+# Welcome to {{var:course_code}}
+
+Welcome to **{{var:course_title}}**, taught by {{var:instructor_name}}.
+
+This is your first Zaphod-managed Canvas page.
+
+## Contact Information
+
+{{include:contact_info}}
+
+## Getting Help
+
+If you have questions, please email {{var:instructor_email}}.
+"""
+
+SAMPLE_ASSIGNMENT = """\
+---
+type: assignment
+name: Sample Assignment
+points_possible: 10
+submission_types:
+  - online_upload
+modules:
+  - Week 1
+indent: 0
+---
+
+# Sample Assignment
+
+Replace this content with your own assignment instructions.
+
+## Late Policy
+
+{{include:late_policy}}
+"""
 
 # Assignment-local rubric wrapper that uses a shared rubric
-SAMPLE_RUBRIC = textwrap.dedent(
-    """\
-    # This assignment uses the shared course-level rubric defined at rubrics/essay_rubric.yaml.
-    use_rubric: "essay_rubric"
-    """
-)
-
-MODULE_ORDER_YAML = textwrap.dedent(
-    """\
-    # Order of modules as they should appear in Canvas
-    # Add, remove, or reorder as needed.
-    - Start Here
-    - Week 1
-    - Week 2
-    """
-)
-
-OUTCOMES_YAML = textwrap.dedent(
-    """\
-    # Course learning outcomes for this course
-    # See sync_clo_via_csv.py for how these are imported into Canvas.
-    course_outcomes:
-      - code: CLO1
-        title: Example outcome
-        description: Students can describe how to work with a text-to-Canvas workflow.
-        mastery_points: 3
-        ratings:
-          - points: 3
-            description: Exceeds expectations
-          - points: 2
-            description: Meets expectations
-          - points: 1
-            description: Below expectations
-    """
-)
+SAMPLE_RUBRIC = """\
+# This assignment uses the shared course-level rubric defined at rubrics/essay_rubric.yaml.
+use_rubric: "essay_rubric"
+"""
 
-DEFAULTS_JSON = textwrap.dedent(
-    """\
-    {
-      "course_id": "REPLACE_ME"
-    }
-    """
-)
-
-QUIZ_SAMPLE_BANK = textwrap.dedent(
-    """\
-    ---
-    name: Sample Question Bank
-    points_per_question: 1
-    ---
-    
-    1. Example multiple choice question
-    a) Wrong answer
-    *b) Correct answer (marked with *)
-    c) Distractor
-    d) Distractor
-    
-    1. Another question (markdown-style numbering - all can be "1.")
-    Select all prime numbers:
-    [*] 2
-    [*] 3
-    [ ] 4
-    [*] 5
-    
-    1. Short answer question
-    * correct answer
-    * alternate correct answer
-    
-    1. Essay question
-    Write a paragraph about your learning goals.
-    ####
-    """
-)
-
-QUIZ_SAMPLE_QUIZ = textwrap.dedent(
-    """\
-    ---
-    name: Sample Quiz
-    type: quiz
-    quiz_type: assignment
-    time_limit: null
-    shuffle_answers: true
-    allowed_attempts: 1
-    modules:
-      - Week 1
-    published: false
-    
-    # Pull questions from banks
-    banks:
-      - name: "sample.bank"
-        pick: 2
-    ---
-    
-    # Sample Quiz
-    
-    This quiz pulls questions from the sample question bank.
-    
-    You can also add inline questions below:
-    
-    1. What is the capital of France?
-    a) London
-    *b) Paris
-    c) Berlin
-    d) Madrid
-    """
-)
+MODULE_ORDER_YAML = """\
+# Order of modules as they should appear in Canvas
+# Add, remove, or reorder as needed.
+- Start Here
+- Week 1
+- Week 2
+"""
+
+OUTCOMES_YAML = """\
+# Course learning outcomes for this course
+# See sync_clo_via_csv.py for how these are imported into Canvas.
+course_outcomes:
+  - code: CLO1
+    title: Example outcome
+    description: Students can describe how to work with a text-to-Canvas workflow.
+    mastery_points: 3
+    ratings:
+      - points: 3
+        description: Exceeds expectations
+      - points: 2
+        description: Meets expectations
+      - points: 1
+        description: Below expectations
+"""
+
+DEFAULTS_JSON = """\
+{
+  "course_id": "REPLACE_ME"
+}
+"""
+
+QUIZ_SAMPLE_BANK = """\
+---
+name: Sample Question Bank
+points_per_question: 1
+---
+
+1. Example multiple choice question
+a) Wrong answer
+*b) Correct answer (marked with *)
+c) Distractor
+d) Distractor
+
+1. Another question (markdown-style numbering - all can be "1.")
+Select all prime numbers:
+[*] 2
+[*] 3
+[ ] 4
+[*] 5
+
+1. Short answer question
+* correct answer
+* alternate correct answer
+
+1. Essay question
+Write a paragraph about your learning goals.
+####
+"""
+
+QUIZ_SAMPLE_QUIZ = """\
+---
+name: Sample Quiz
+type: quiz
+quiz_type: assignment
+time_limit: null
+shuffle_answers: true
+allowed_attempts: 1
+modules:
+  - Week 1
+published: false
+
+# Pull questions from banks
+banks:
+  - name: "sample.bank"
+    pick: 2
+---
+
+# Sample Quiz
+
+This quiz pulls questions from the sample question bank.
+
+You can also add inline questions below:
+
+1. What is the capital of France?
+a) London
+*b) Paris
+c) Berlin
+d) Madrid
+"""
 
 # Shared course-level rubric (rubrics/essay_rubric.yaml)
-RUBRIC_SHARED_ESSAY = textwrap.dedent(
-    """\
-    title: "Essay Rubric"
-    free_form_criterion_comments: false
-
-    criteria:
-      - description: "Thesis and focus"
-        long_description: "Clarity and strength of the main argument."
+RUBRIC_SHARED_ESSAY = """\
+title: "Essay Rubric"
+free_form_criterion_comments: false
+
+criteria:
+  - description: "Thesis and focus"
+    long_description: "Clarity and strength of the main argument."
+    points: 10
+    ratings:
+      - description: "Excellent"
+        long_description: "Clear, original thesis; fully focused throughout."
         points: 10
-        ratings:
-          - description: "Excellent"
-            long_description: "Clear, original thesis; fully focused throughout."
-            points: 10
-          - description: "Satisfactory"
-            long_description: "Thesis is present but may be vague or unevenly supported."
-            points: 8
-          - description: "Needs improvement"
-            long_description: "Thesis is missing, unclear, or not supported."
-            points: 5
-
-      - description: "Organization"
-        long_description: "Logical structure, paragraphing, and flow."
+      - description: "Satisfactory"
+        long_description: "Thesis is present but may be vague or unevenly supported."
+        points: 8
+      - description: "Needs improvement"
+        long_description: "Thesis is missing, unclear, or not supported."
+        points: 5
+
+  - description: "Organization"
+    long_description: "Logical structure, paragraphing, and flow."
+    points: 10
+    ratings:
+      - description: "Excellent"
+        long_description: "Clear structure, smooth transitions, easy to follow."
         points: 10
-        ratings:
-          - description: "Excellent"
-            long_description: "Clear structure, smooth transitions, easy to follow."
-            points: 10
-          - description: "Satisfactory"
-            long_description: "Mostly organized; some awkward transitions or jumps."
-            points: 8
-          - description: "Needs improvement"
-            long_description: "Hard to follow; ideas feel scattered."
-            points: 5
-
-      - "{{rubric_row:writing_clarity}}"
-    """
-)
+      - description: "Satisfactory"
+        long_description: "Mostly organized; some awkward transitions or jumps."
+        points: 8
+      - description: "Needs improvement"
+        long_description: "Hard to follow; ideas feel scattered."
+        points: 5
+
+  - "{{rubric_row:writing_clarity}}"
+"""
 
 # Shared row snippet (rubrics/rows/writing_clarity.yaml)
-RUBRIC_ROW_WRITING_CLARITY = textwrap.dedent(
-    """\
-    - description: "Writing clarity and mechanics"
-      long_description: "Grammar, syntax, and organization support readability."
+RUBRIC_ROW_WRITING_CLARITY = """\
+- description: "Writing clarity and mechanics"
+  long_description: "Grammar, syntax, and organization support readability."
+  points: 10
+  ratings:
+    - description: "Excellent"
+      long_description: "Clear, fluent writing; virtually no errors."
       points: 10
-      ratings:
-        - description: "Excellent"
-          long_description: "Clear, fluent writing; virtually no errors."
-          points: 10
-        - description: "Minor issues"
-          long_description: "Generally clear; minor errors do not impede understanding."
-          points: 8
-        - description: "Major issues"
-          long_description: "Frequent errors or disorganization impede understanding."
-          points: 5
-    """
-)
+    - description: "Minor issues"
+      long_description: "Generally clear; minor errors do not impede understanding."
+      points: 8
+    - description: "Major issues"
+      long_description: "Frequent errors or disorganization impede understanding."
+      points: 5
+"""
 
 # =============================================================================
 # NEW: Shared folder content
 # =============================================================================
 
-SHARED_VARIABLES = textwrap.dedent(
-    """\
-    # Course-wide variables
-    # These are available in all pages using {{var:variable_name}}
-    # Page frontmatter can override any of these values.
-    
-    # Course information
-    course_code: "CS 101"
-    course_title: "Introduction to Computer Science"
-    semester: "Spring 2026"
-    
-    # Instructor information
-    instructor_name: "Dr. Ada Lovelace"
-    instructor_email: "lovelace@university.edu"
-    instructor_office: "Engineering Building, Room 142"
-    office_hours: "Tuesday/Thursday 2-4pm"
-    
-    # TA information (optional)
-    # ta_name: "Charles Babbage"
-    # ta_email: "babbage@university.edu"
-    
-    # Common phrases
-    late_penalty: "10% per day, up to 3 days"
+SHARED_VARIABLES = """\
+# Course-wide variables
+# These are available in all pages using {{var:variable_name}}
+# Page frontmatter can override any of these values.
+
+# Course information
+course_code: "CS 101"
+course_title: "Introduction to Computer Science"
+semester: "Spring 2026"
+
+# Instructor information
+instructor_name: "Dr. Ada Lovelace"
+instructor_email: "lovelace@university.edu"
+instructor_office: "Engineering Building, Room 142"
+office_hours: "Tuesday/Thursday 2-4pm"
+
+# TA information (optional)
+# ta_name: "Charles Babbage"
+# ta_email: "babbage@university.edu"
+
+# Common phrases
+late_penalty: "10% per day, up to 3 days"
+"""
+
+SHARED_CONTACT_INFO = """\
+**Instructor:** {{var:instructor_name}}  
+**Email:** {{var:instructor_email}}  
+**Office:** {{var:instructor_office}}  
+**Office Hours:** {{var:office_hours}}
+"""
+
+SHARED_LATE_POLICY = """\
+Late submissions will receive a penalty of {{var:late_penalty}}. 
+After 3 days, late submissions will not be accepted without prior arrangement.
+
+If you need an extension, please contact the instructor **before** the due date.
+"""
+
+
+# UTF-8 bytes of each template, encoded once at import; the manifest hands
+# these straight to write_file
+_T_BYTES: dict[str, bytes] = {
+    "WELCOME_PAGE": WELCOME_PAGE.encode("utf-8"),
+    "SAMPLE_ASSIGNMENT": SAMPLE_ASSIGNMENT.encode("utf-8"),
+    "SAMPLE_RUBRIC": SAMPLE_RUBRIC.encode("utf-8"),
+    "MODULE_ORDER_YAML": MODULE_ORDER_YAML.encode("utf-8"),
+    "OUTCOMES_YAML": OUTCOMES_YAML.encode("utf-8"),
+    "DEFAULTS_JSON": DEFAULTS_JSON.encode("utf-8"),
+    "QUIZ_SAMPLE_BANK": QUIZ_SAMPLE_BANK.encode("utf-8"),
+    "QUIZ_SAMPLE_QUIZ": QUIZ_SAMPLE_QUIZ.encode("utf-8"),
+    "RUBRIC_SHARED_ESSAY": RUBRIC_SHARED_ESSAY.encode("utf-8"),
+    "RUBRIC_ROW_WRITING_CLARITY": RUBRIC_ROW_WRITING_CLARITY.encode("utf-8"),
+    "SHARED_VARIABLES": SHARED_VARIABLES.encode("utf-8"),
+    "SHARED_CONTACT_INFO": SHARED_CONTACT_INFO.encode("utf-8"),
+    "SHARED_LATE_POLICY": SHARED_LATE_POLICY.encode("utf-8"),
+}
+
+
+NEXT_STEPS = """
+[scaffold] Done!
+
+Next steps:
+  1. Edit shared/variables.yaml with your course details
+  2. Edit the sample content in content/
+  3. Run: zaphod sync --dry-run
+  4. Run: zaphod sync"""
+
+
+def build_manifest(content_dir: str) -> list[tuple[str, bytes, bool]]:
     """
-)
-
-SHARED_CONTACT_INFO = textwrap.dedent(
-    """\
-    **Instructor:** {{var:instructor_name}}  
-    **Email:** {{var:instructor_email}}  
-    **Office:** {{var:instructor_office}}  
-    **Office Hours:** {{var:office_hours}}
+    Files written by the scaffold, as (path relative to the course root,
+    template bytes, overwritable).
+
+    content_dir varies with --legacy, so the table is built per run.
+    Entries that are not overwritable are never replaced, even with --force.
     """
-)
-
-SHARED_LATE_POLICY = textwrap.dedent(
-    """\
-    Late submissions will receive a penalty of {{var:late_penalty}}. 
-    After 3 days, late submissions will not be accepted without prior arrangement.
-    
-    If you need an extension, please contact the instructor **before** the due date.
+    return [
+        # Example page and assignment, with a rubric wrapper pointing at
+        # the shared rubric
+        (os.path.join(content_dir, "welcome.page", "index.md"), _T_BYTES["WELCOME_PAGE"], True),
+        (os.path.join(content_dir, "sample-assignment.assignment", "index.md"), _T_BYTES["SAMPLE_ASSIGNMENT"], True),
+        (os.path.join(content_dir, "sample-assignment.assignment", "rubric.yaml"), _T_BYTES["SAMPLE_RUBRIC"], True),
+        # Module order and outcomes
+        (os.path.join(MODULES_DIR, "module_order.yaml"), _T_BYTES["MODULE_ORDER_YAML"], True),
+        (os.path.join(OUTCOMES_DIR, "outcomes.yaml"), _T_BYTES["OUTCOMES_YAML"], True),
+        # Metadata defaults (never overwrite, to avoid clobbering course_id)
+        (os.path.join(METADATA_DIR, "defaults.json"), _T_BYTES["DEFAULTS_JSON"], False),
+        # Sample question bank (new .bank.md format) and a quiz that uses it
+        (os.path.join(QUESTION_BANKS_DIR, "sample.bank.md"), _T_BYTES["QUIZ_SAMPLE_BANK"], True),
+        (os.path.join(content_dir, "sample-quiz.quiz", "index.md"), _T_BYTES["QUIZ_SAMPLE_QUIZ"], True),
+        # Shared rubric and row snippet
+        (os.path.join(RUBRICS_DIR, "essay_rubric.yaml"), _T_BYTES["RUBRIC_SHARED_ESSAY"], True),
+        (os.path.join(RUBRIC_ROWS_DIR, "writing_clarity.yaml"), _T_BYTES["RUBRIC_ROW_WRITING_CLARITY"], True),
+        # Shared variables and includes
+        (os.path.join(SHARED_DIR, "variables.yaml"), _T_BYTES["SHARED_VARIABLES"], True),
+        (os.path.join(SHARED_DIR, "contact_info.md"), _T_BYTES["SHARED_CONTACT_INFO"], True),
+        (os.path.join(SHARED_DIR, "late_policy.md"), _T_BYTES["SHARED_LATE_POLICY"], True),
+    ]
+
+
+# Flags the fast path in parse_args() understands without argparse
+SCAFFOLD_FLAGS = frozenset({"--force", "--legacy"})
+
+
+def parse_args(argv: list[str]) -> tuple[bool, bool]:
     """
-)
+    Return (force, legacy) from the command line.
 
+    `zaphod init` only ever passes the plain flags, which are handled
+    directly; argparse is imported only for --help, abbreviations, or
+    errors.
+    """
+    if SCAFFOLD_FLAGS.issuperset(argv):
+        return "--force" in argv, "--legacy" in argv
+
+    import argparse
 
-def main() -> None:
     parser = argparse.ArgumentParser(
         description="Scaffold a Zaphod course in the current directory"
     )
@@ -335,80 +441,38 @@ def main() -> None:
         action="store_true",
         help="Use legacy folder names (pages/ instead of content/)",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    return args.force, args.legacy
 
-    print(f"[scaffold] COURSE_ROOT = {COURSE_ROOT}")
 
-    # Determine content directory name
-    content_dir = COURSE_ROOT / "pages" if args.legacy else CONTENT_DIR
-    content_name = "pages" if args.legacy else "content"
-    print(f"[scaffold] Using {content_name}/ for content")
-
-    # Create directories
-    for d in [
-        content_dir,
-        SHARED_DIR,
-        MODULES_DIR,
-        OUTCOMES_DIR,
-        QUESTION_BANKS_DIR,
-        ASSETS_DIR,
-        METADATA_DIR,
-        RUBRICS_DIR,
-        RUBRIC_ROWS_DIR,
-    ]:
-        ensure_dir(d)
-
-    # Example page and assignment
-    write_file(content_dir / "welcome.page" / "index.md", WELCOME_PAGE, force=args.force)
-    write_file(
-        content_dir / "sample-assignment.assignment" / "index.md",
-        SAMPLE_ASSIGNMENT,
-        force=args.force,
-    )
-
-    # Sample assignment rubric wrapper, pointing at shared rubric
-    write_file(
-        content_dir / "sample-assignment.assignment" / "rubric.yaml",
-        SAMPLE_RUBRIC,
-        force=args.force,
-    )
-
-    # Module order
-    write_file(MODULES_DIR / "module_order.yaml", MODULE_ORDER_YAML, force=args.force)
-
-    # Outcomes
-    write_file(OUTCOMES_DIR / "outcomes.yaml", OUTCOMES_YAML, force=args.force)
-
-    # Metadata defaults (never overwrite, to avoid clobbering course_id)
-    write_file(METADATA_DIR / "defaults.json", DEFAULTS_JSON, force=False)
-
-    # Sample question bank (new .bank.md format)
-    write_file(QUESTION_BANKS_DIR / "sample.bank.md", QUIZ_SAMPLE_BANK, force=args.force)
-
-    # Sample quiz (uses question bank)
-    write_file(content_dir / "sample-quiz.quiz" / "index.md", QUIZ_SAMPLE_QUIZ, force=args.force)
-
-    # Shared rubric and row snippet
-    write_file(RUBRICS_DIR / "essay_rubric.yaml", RUBRIC_SHARED_ESSAY, force=args.force)
-    write_file(
-        RUBRIC_ROWS_DIR / "writing_clarity.yaml",
-        RUBRIC_ROW_WRITING_CLARITY,
-        force=args.force,
-    )
-
-    # NEW: Shared variables and includes
-    write_file(SHARED_DIR / "variables.yaml", SHARED_VARIABLES, force=args.force)
-    write_file(SHARED_DIR / "contact_info.md", SHARED_CONTACT_INFO, force=args.force)
-    write_file(SHARED_DIR / "late_policy.md", SHARED_LATE_POLICY, force=args.force)
-
-    print()
-    print("[scaffold] Done!")
-    print()
-    print("Next steps:")
-    print("  1. Edit shared/variables.yaml with your course details")
-    print("  2. Edit the sample content in content/")
-    print("  3. Run: zaphod sync --dry-run")
-    print("  4. Run: zaphod sync")
+def main() -> None:
+    force, legacy = parse_args(sys.argv[1:])
+
+    # Output is collected and written once at the end (or on error)
+    course_root = os.getcwd()
+    log = [f"[scaffold] COURSE_ROOT = {course_root}"]
+    try:
+        # Determine content directory name
+        content_dir = LEGACY_CONTENT_DIR if legacy else CONTENT_DIR
+        log.append(f"[scaffold] Using {content_dir}/ for content")
+
+        # Create directories
+        ensure_dir(course_root, content_dir)
+        for d in SCAFFOLD_DIRS:
+            ensure_dir(course_root, d)
+
+        # Sample content; files are independent, so write them concurrently
+        def write_entry(entry: tuple[str, bytes, bool]) -> str:
+            rel, content, overwritable = entry
+            return write_file(course_root, rel, content, force=force and overwritable)
+
+        manifest = build_manifest(content_dir)
+        with ThreadPoolExecutor(max_workers=min(SCAFFOLD_WRITE_WORKERS, len(manifest))) as pool:
+            log.extend(pool.map(write_entry, manifest))
+
+        log.append(NEXT_STEPS)
+    finally:
+        sys.stdout.write("\n".join(log) + "\n")
 
 
 if __name__ == "__main__":
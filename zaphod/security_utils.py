@@ -11,6 +11,7 @@ handling across all Zaphod scripts.
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import ipaddress
 import os
@@ -84,6 +85,18 @@ def load_canvas_credentials_safe(cred_path: Optional[str] = None) -> Tuple[str,
     return api_url.rstrip("/"), api_key
 
 
+# One scan of a credentials file finds every API_KEY/API_URL assignment.
+# Values are captured inside a lookahead so only the name is consumed, and
+# the first branch that matches ranks the format: quoted, bare, YAML-style.
+CREDENTIAL_PATTERN = re.compile(
+    r"""API_(?P<which>KEY|URL)(?="""
+    r"""\s*=\s*["'](?P<quoted>[^"']+)["']"""
+    r"""|\s*=\s*(?P<bare>\S+)"""
+    r"""|\s*:\s*["']?(?P<yaml>[^"'\n]+)["']?"""
+    r""")"""
+)
+
+
 def _parse_credentials_file(cred_file: Path) -> Tuple[Optional[str], Optional[str]]:
     """
     Parse credentials file safely without exec().
@@ -92,36 +105,24 @@ def _parse_credentials_file(cred_file: Path) -> Tuple[Optional[str], Optional[st
     - API_KEY = "value" or API_KEY = 'value'
     - API_KEY="value" (no spaces)
     - API_KEY: value (YAML-style)
+    
+    For each key the best-ranked format wins, and among equals the first
+    occurrence in the file.
     """
     content = cred_file.read_text(encoding="utf-8")
     
-    api_key = None
-    api_url = None
-    
-    # Patterns to match different formats
-    patterns = [
-        # Python-style: API_KEY = "value" or API_KEY = 'value'
-        (r'API_KEY\s*=\s*["\']([^"\']+)["\']', r'API_URL\s*=\s*["\']([^"\']+)["\']'),
-        # No quotes: API_KEY = value
-        (r'API_KEY\s*=\s*(\S+)', r'API_URL\s*=\s*(\S+)'),
-        # YAML-style: API_KEY: value
-        (r'API_KEY\s*:\s*["\']?([^"\'\n]+)["\']?', r'API_URL\s*:\s*["\']?([^"\'\n]+)["\']?'),
-    ]
-    
-    for key_pattern, url_pattern in patterns:
-        if api_key is None:
-            match = re.search(key_pattern, content)
-            if match:
-                api_key = match.group(1).strip()
-        
-        if api_url is None:
-            match = re.search(url_pattern, content)
-            if match:
-                api_url = match.group(1).strip()
-        
-        if api_key and api_url:
-            break
-    
+    # "KEY"/"URL" -> (format rank, value)
+    found: Dict[str, Tuple[int, str]] = {}
+    for match in CREDENTIAL_PATTERN.finditer(content):
+        which = match.group("which")
+        for rank, value in enumerate(match.group("quoted", "bare", "yaml")):
+            if value is not None:
+                break
+        if which not in found or rank < found[which][0]:
+            found[which] = (rank, value.strip())
+    
+    api_key = found["KEY"][1] if "KEY" in found else None
+    api_url = found["URL"][1] if "URL" in found else None
     return api_key, api_url
 
 
@@ -185,11 +186,19 @@ def mask_sensitive(value: str, visible_chars: int = 4) -> str:
 # Path Validation and Sanitization
 # ============================================================================
 
+@functools.lru_cache(maxsize=256)
+def _realpath_cached(path: str) -> str:
+    """os.path.realpath for base directories, which are checked repeatedly."""
+    return os.path.realpath(path)
+
+
 def is_safe_path(base_dir: Path, target_path: Path) -> bool:
     """
     Check if target_path is safely within base_dir (no symlink escape).
     
     Prevents path traversal attacks via symlinks or ../ sequences.
+    The base directory's resolution is memoized; the target is resolved
+    on every call so a swapped symlink is always seen.
     
     Args:
         base_dir: The allowed base directory
@@ -198,18 +207,23 @@ def is_safe_path(base_dir: Path, target_path: Path) -> bool:
     Returns:
         True if target is within base (safe), False otherwise
     """
+    # Resolve both paths to absolute, following symlinks
+    base_real = _realpath_cached(os.fspath(base_dir))
+    target_real = os.path.realpath(target_path)
+    
+    # Check if target is within base
     try:
-        # Resolve both paths to absolute, following symlinks
-        base_resolved = base_dir.resolve()
-        target_resolved = target_path.resolve()
-        
-        # Check if target is within base
-        target_resolved.relative_to(base_resolved)
-        return True
+        return os.path.commonpath([base_real, target_real]) == base_real
     except ValueError:
+        # Different drives
         return False
 
 
+# sanitize_filename: characters to drop, and runs collapsed to one hyphen
+FILENAME_UNSAFE_PATTERN = re.compile(r'[^\w\s-]')
+FILENAME_SEPARATOR_PATTERN = re.compile(r'[-\s]+')
+
+
 def sanitize_filename(name: str, max_length: int = 255) -> str:
     """
     Create a safe filename from user input.
@@ -234,10 +248,10 @@ def sanitize_filename(name: str, max_length: int = 255) -> str:
     
     # Remove or replace dangerous characters
     # Allow: alphanumeric, spaces, hyphens, underscores
-    safe = re.sub(r'[^\w\s-]', '', name)
+    safe = FILENAME_UNSAFE_PATTERN.sub('', name)
     
     # Replace multiple spaces/hyphens with single hyphen
-    safe = re.sub(r'[-\s]+', '-', safe)
+    safe = FILENAME_SEPARATOR_PATTERN.sub('-', safe)
     
     # Remove leading/trailing hyphens
     safe = safe.strip('-')
@@ -448,17 +462,22 @@ def get_file_hash(file_path: Path) -> str:
     """
     Get SHA-256 hash of file contents for change detection.
     
+    Uses hashlib.file_digest (read loop in C) on Python 3.11+, otherwise
+    reads in 1 MiB chunks.
+    
     Args:
         file_path: Path to file
         
     Returns:
         Hex string of SHA-256 hash
     """
-    hasher = hashlib.sha256()
     with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        hasher = hashlib.sha256()
+        while chunk := f.read(1 << 20):
             hasher.update(chunk)
-    return hasher.hexdigest()
+        return hasher.hexdigest()
 
 
 def get_content_hash(content: Union[str, bytes]) -> str:
@@ -491,7 +510,6 @@ MIGRATION_TIMEOUT = (10, 60)  # For migration status checks
 # ============================================================================
 
 import time
-from collections import deque
 from threading import Lock
 
 class RateLimiter:
@@ -512,58 +530,60 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.timestamps: deque = deque()
         self.lock = Lock()
+        # Token bucket: holds up to max_requests, refilled continuously so
+        # that max_requests become available again over window_seconds.
+        # All times are time.monotonic(), immune to wall-clock jumps.
+        self._rate = max_requests / window_seconds
+        self._tokens = float(max_requests)
+        self._last_refill = time.monotonic()
         self._slowdown_until = 0.0
     
     def wait_if_needed(self):
         """
         Wait if rate limit would be exceeded.
         
-        Call this before making an API request.
+        Call this before making an API request. The lock is only held to
+        update the bucket, never while sleeping, so callers that have a
+        token available are not blocked behind ones that are waiting.
         """
-        with self.lock:
-            now = time.time()
-            
-            # Check if we're in slowdown mode (from rate limit response)
-            if now < self._slowdown_until:
-                sleep_time = self._slowdown_until - now
-                print(f"[rate-limit] Waiting {sleep_time:.1f}s (rate limit cooldown)")
-                time.sleep(sleep_time)
-                now = time.time()
-            
-            # Remove timestamps outside window
-            cutoff = now - self.window_seconds
-            while self.timestamps and self.timestamps[0] < cutoff:
-                self.timestamps.popleft()
-            
-            # Check if at limit
-            if len(self.timestamps) >= self.max_requests:
-                # Wait until oldest request is outside window
-                sleep_time = self.timestamps[0] - cutoff + 0.1
-                if sleep_time > 0:
-                    print(f"[rate-limit] Waiting {sleep_time:.1f}s to stay under limit")
-                    time.sleep(sleep_time)
-                    now = time.time()
-                    # Clean up again
-                    cutoff = now - self.window_seconds
-                    while self.timestamps and self.timestamps[0] < cutoff:
-                        self.timestamps.popleft()
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                
+                # Check if we're in slowdown mode (from rate limit response)
+                if now < self._slowdown_until:
+                    sleep_time = self._slowdown_until - now
+                    reason = "(rate limit cooldown)"
+                else:
+                    self._tokens = min(
+                        self.max_requests,
+                        self._tokens + (now - self._last_refill) * self._rate,
+                    )
+                    self._last_refill = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    sleep_time = (1 - self._tokens) / self._rate
+                    reason = "to stay under limit"
             
-            # Record this request
-            self.timestamps.append(now)
+            print(f"[rate-limit] Waiting {sleep_time:.1f}s {reason}")
+            time.sleep(sleep_time)
     
     def handle_rate_limit_response(self, retry_after: float = 60.0):
         """
         Handle a rate limit response from Canvas.
         
-        Call this when you receive a 403 rate limit error.
+        Call this when you receive a 403 rate limit error. The bucket is
+        emptied and only starts refilling once the cooldown has passed.
         
         Args:
             retry_after: Seconds to wait (from X-Rate-Limit-Remaining or default)
         """
         with self.lock:
-            self._slowdown_until = time.time() + retry_after
+            self._slowdown_until = time.monotonic() + retry_after
+            self._tokens = 0.0
+            self._last_refill = self._slowdown_until
             print(f"[rate-limit] Canvas rate limit hit, backing off for {retry_after}s")
     
     def check_response_headers(self, headers: dict):
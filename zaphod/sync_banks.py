@@ -67,6 +67,7 @@ import hashlib
 import html
 import io
 import json
+import mmap
 import os
 import re
 import time
@@ -127,26 +128,70 @@ def save_bank_cache(cache: Dict[str, Any]):
 
 
 def compute_bank_hash(file_path: Path) -> str:
-    """Compute a hash of the bank file content."""
-    if not file_path.exists():
+    """
+    Compute a hash of the bank file content.
+
+    The file is memory-mapped and its raw bytes hashed without decoding.
+    CR/CRLF line endings are folded to LF first, so hashes match those of
+    the decoded text and existing cache entries stay valid.
+    """
+    try:
+        fh = open(file_path, "rb")
+    except FileNotFoundError:
         return ""
-    
-    content = file_path.read_text(encoding="utf-8")
-    return hashlib.md5(content.encode()).hexdigest()[:12]
 
+    with fh:
+        try:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"\r") < 0:
+                    return hashlib.md5(mm, usedforsecurity=False).hexdigest()[:12]
+                data = mm[:]
+        except (OSError, ValueError):
+            data = fh.read()  # empty or unmappable file
+
+    data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return hashlib.md5(data, usedforsecurity=False).hexdigest()[:12]
 
-def bank_needs_sync(file_path: Path, cache: Dict[str, Any], force: bool = False) -> bool:
-    """Check if a bank needs to be synced based on content hash."""
+
+def _stat_signature(file_path: Path, st: Optional[os.stat_result] = None) -> Dict[str, int]:
+    """Return the mtime_ns/size pair stored alongside a bank's hash."""
+    if st is None:
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            return {}
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def bank_needs_sync(
+    file_path: Path,
+    cache: Dict[str, Any],
+    force: bool = False,
+    st: Optional[os.stat_result] = None,
+) -> bool:
+    """
+    Check if a bank needs to be synced based on content hash.
+
+    A matching mtime_ns and size in the cache entry counts as unchanged
+    without reading the file. Otherwise the content hash decides, and a
+    touched-but-identical file has its cached stat refreshed so the next
+    run can skip the read. st, when given, is a stat result already
+    taken for file_path (see _scan_bank_files).
+    """
     if force:
         return True
     
-    current_hash = compute_bank_hash(file_path)
     cache_key = str(file_path.relative_to(COURSE_ROOT))
-    
     cached = cache.get(cache_key, {})
-    cached_hash = cached.get("hash")
-    
-    if cached_hash == current_hash:
+    if cached.get("hash") is None:
+        return True
+
+    signature = _stat_signature(file_path, st)
+    if signature and all(cached.get(k) == v for k, v in signature.items()):
+        return False
+
+    if cached["hash"] == compute_bank_hash(file_path):
+        cached.update(signature)
         return False
     
     return True
@@ -157,6 +202,7 @@ def update_bank_cache(file_path: Path, bank_name: str, cache: Dict[str, Any], mi
     cache_key = str(file_path.relative_to(COURSE_ROOT))
     cache[cache_key] = {
         "hash": compute_bank_hash(file_path),
+        **_stat_signature(file_path),
         "bank_name": bank_name,
         "uploaded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
         "migration_id": migration_id,
@@ -285,8 +331,30 @@ MULTI_ANSWER_RE = re.compile(r"^\s*\[(\*|\s)\]\s*(.*\S)\s*$")
 SHORT_ANSWER_RE = re.compile(r"^\s*\*\s+(.+\S)\s*$")
 TF_TRUE_RE = re.compile(r"^\s*\*a\)\s*True\s*$", re.IGNORECASE)
 TF_FALSE_RE = re.compile(r"^\s*\*b\)\s*False\s*$", re.IGNORECASE)
+TF_TRUE_HINT_RE = re.compile(r"a\)\s*True", re.IGNORECASE)
+TF_FALSE_HINT_RE = re.compile(r"b\)\s*False", re.IGNORECASE)
 INLINE_CODE_RE = re.compile(r"`([^`]+)`")
 
+# Blank-line separators and fenced code regions (which may contain blank
+# lines) in newline-joined quiz text; see split_questions().
+QUESTION_SPLIT_RE = re.compile(
+    r"^[^\S\n]*(?:"
+    r"(?P<fence>(?:```|~~~).*?(?:\n[^\S\n]*(?:```|~~~)[^\n]*|\Z))"
+    r"|(?P<blank>\n|\Z))",
+    re.MULTILINE | re.DOTALL,
+)
+
+# Stem tokens, each starting at the newline before a line: fenced code
+# blocks (through the closing fence, or to the end if unclosed) and blank
+# lines. Text between tokens is paragraph text; see stem_to_html().
+STEM_TOKEN_RE = re.compile(
+    r"\n[^\S\n]*(?:"
+    r"(?P<fence>(?:```|~~~)(?P<lang>[^\n]*)(?:\n(?P<code>.*?))??"
+    r"(?P<close>\n[^\S\n]*(?:```|~~~)[^\n]*|\Z))"
+    r"|(?P<blank>(?=\n|\Z)))",
+    re.DOTALL,
+)
+
 
 def escape_html_text(text: str) -> str:
     """Escape HTML special characters."""
@@ -295,66 +363,37 @@ def escape_html_text(text: str) -> str:
 
 def stem_to_html(stem: str) -> str:
     """Convert question stem (markdown-ish) to HTML for QTI."""
-    lines = stem.split('\n')
+    # Leading newline so the first line starts a token like every other
+    text = "\n" + stem
     result_parts = []
-    current_para = []
-    in_code_block = False
-    code_block_lines = []
-    code_lang = ""
-    
-    def flush_paragraph():
-        nonlocal current_para
-        if current_para:
-            text = ' '.join(current_para)
-            parts = []
-            last_end = 0
-            for match in INLINE_CODE_RE.finditer(text):
-                parts.append(escape_html_text(text[last_end:match.start()]))
-                parts.append(f'<code>{escape_html_text(match.group(1))}</code>')
-                last_end = match.end()
-            parts.append(escape_html_text(text[last_end:]))
-            text = ''.join(parts)
-            result_parts.append(f"<p>{text}</p>")
-            current_para = []
-    
-    for line in lines:
-        stripped = line.strip()
-        
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            if not in_code_block:
-                flush_paragraph()
-                in_code_block = True
-                code_lang = stripped[3:].strip()
-                code_block_lines = []
+    last_end = 0
+
+    def flush_paragraph(end):
+        # Lines between tokens form one paragraph, joined with spaces
+        para = text[last_end + 1:end]
+        if para.strip():
+            para = para.replace("\n", " ")
+            result_parts.append(f"<p>{answer_to_html(para)}</p>")
+
+    for m in STEM_TOKEN_RE.finditer(text):
+        flush_paragraph(m.start())
+        last_end = m.end()
+        if m.lastgroup == "blank":
+            continue
+
+        # An unclosed fence only yields a block if it has content lines
+        code = m.group("code")
+        if m.group("close") or code is not None:
+            code_content = escape_html_text(code or "")
+            code_lang = m.group("lang").strip()
+            if code_lang:
+                result_parts.append(
+                    f'<pre><code class="language-{escape_html_text(code_lang)}">{code_content}</code></pre>'
+                )
             else:
-                in_code_block = False
-                code_content = escape_html_text('\n'.join(code_block_lines))
-                if code_lang:
-                    result_parts.append(
-                        f'<pre><code class="language-{escape_html_text(code_lang)}">{code_content}</code></pre>'
-                    )
-                else:
-                    result_parts.append(f'<pre><code>{code_content}</code></pre>')
-                code_block_lines = []
-                code_lang = ""
-        elif in_code_block:
-            code_block_lines.append(line)
-        elif not stripped:
-            flush_paragraph()
-        else:
-            current_para.append(line)
-    
-    flush_paragraph()
-    
-    if in_code_block and code_block_lines:
-        code_content = escape_html_text('\n'.join(code_block_lines))
-        if code_lang:
-            result_parts.append(
-                f'<pre><code class="language-{escape_html_text(code_lang)}">{code_content}</code></pre>'
-            )
-        else:
-            result_parts.append(f'<pre><code>{code_content}</code></pre>')
-    
+                result_parts.append(f'<pre><code>{code_content}</code></pre>')
+
+    flush_paragraph(len(text))
     return '\n'.join(result_parts)
 
 
@@ -397,27 +436,25 @@ def split_frontmatter_and_body(raw: str) -> Tuple[Dict[str, Any], str]:
 
 def split_questions(raw: str) -> List[List[str]]:
     """Split quiz text into question blocks, preserving code blocks."""
-    lines = raw.splitlines()
+    # Normalise line endings the same way str.splitlines() does
+    text = "\n".join(raw.splitlines())
     blocks: List[List[str]] = []
-    cur: List[str] = []
-    in_code_block = False
-
-    def push():
-        nonlocal cur, blocks
-        if cur and any(line.strip() for line in cur):
-            blocks.append(cur)
-        cur = []
-
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            in_code_block = not in_code_block
-            cur.append(line)
-        elif not line.strip() and not in_code_block:
-            push()
-        else:
-            cur.append(line)
-    push()
+    start = 0
+    for m in QUESTION_SPLIT_RE.finditer(text):
+        if m.lastgroup == "fence":
+            # Blank lines inside fenced code do not split; an unclosed
+            # fence runs to the end of the text
+            if m.end() == len(text):
+                break
+            continue
+        if m.start() > start:
+            chunk = text[start:m.start() - 1]  # drop the newline before it
+            if chunk.strip():
+                blocks.append(chunk.split("\n"))
+        start = m.end()
+    chunk = text[start:]
+    if chunk.strip():
+        blocks.append(chunk.split("\n"))
     return blocks
 
 
@@ -436,8 +473,8 @@ def detect_qtype(block: List[str]) -> str:
     if any(SHORT_ANSWER_RE.match(line) for line in block):
         return "short_answer"
 
-    has_true = any(re.search(r"a\)\s*True", line, re.IGNORECASE) for line in block)
-    has_false = any(re.search(r"b\)\s*False", line, re.IGNORECASE) for line in block)
+    has_true = any(TF_TRUE_HINT_RE.search(line) for line in block)
+    has_false = any(TF_FALSE_HINT_RE.search(line) for line in block)
     if has_true and has_false:
         return "true_false"
 
@@ -999,6 +1036,9 @@ def get_changed_files() -> List[Path]:
     return [Path(p) for p in raw.splitlines() if p.strip()]
 
 
+NATURAL_SORT_SPLIT_RE = re.compile(r'(\d+)')
+
+
 def natural_sort_key(path: Path) -> tuple:
     """
     Natural sort key for file paths.
@@ -1007,26 +1047,46 @@ def natural_sort_key(path: Path) -> tuple:
     - 1, 2, 3, 10, 11 sorts correctly (not 1, 10, 11, 2, 3)
     - "chapter1" comes before "chapter2" which comes before "chapter10"
     """
-    import re
-    parts = re.split(r'(\d+)', path.name)
+    parts = NATURAL_SORT_SPLIT_RE.split(path.name)
     return tuple(int(p) if p.isdigit() else p.lower() for p in parts)
 
 
-def iter_bank_files_full() -> List[Path]:
-    """Get all bank files in question-banks/."""
+def _scan_bank_files() -> List[Tuple[Path, os.stat_result]]:
+    """
+    List bank files in question-banks/ with their stat results in one pass.
+
+    Returns naturally sorted (path, stat) pairs, so the sync loop can compare
+    mtime/size against the cache without stat'ing each file again.
+    """
     if not QUESTION_BANKS_DIR.exists():
         return []
     
-    files = []
-    # New format: *.bank.md
-    files.extend(QUESTION_BANKS_DIR.glob("*.bank.md"))
-    # Legacy format: *.quiz.txt (deprecated)
-    legacy = list(QUESTION_BANKS_DIR.glob("*.quiz.txt"))
-    if legacy:
-        print(f"⚠️ Found {len(legacy)} legacy *.quiz.txt files - consider renaming to *.bank.md")
-    files.extend(legacy)
+    banks: List[Tuple[Path, os.stat_result]] = []
+    legacy_count = 0
+    with os.scandir(QUESTION_BANKS_DIR) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(".bank.md"):
+                pass  # New format: *.bank.md
+            elif name.endswith(".quiz.txt"):
+                legacy_count += 1  # Legacy format: *.quiz.txt (deprecated)
+            else:
+                continue
+            try:
+                banks.append((QUESTION_BANKS_DIR / name, entry.stat()))
+            except FileNotFoundError:
+                continue
+    
+    if legacy_count:
+        print(f"⚠️ Found {legacy_count} legacy *.quiz.txt files - consider renaming to *.bank.md")
     
-    return sorted(files, key=natural_sort_key)
+    banks.sort(key=lambda item: natural_sort_key(item[0]))
+    return banks
+
+
+def iter_bank_files_full() -> List[Path]:
+    """Get all bank files in question-banks/."""
+    return [path for path, _ in _scan_bank_files()]
 
 
 def iter_bank_files_incremental(changed_files: List[Path]) -> List[Path]:
@@ -1093,7 +1153,8 @@ def main():
     # Load bank cache for incremental sync
     bank_cache = load_bank_cache()
     
-    # Determine which files to process
+    # Determine which files to process; a full scan also snapshots stats
+    bank_stats: Dict[Path, os.stat_result] = {}
     if args.file:
         bank_files = [args.file]
     else:
@@ -1106,7 +1167,8 @@ def main():
                 return
         else:
             # Regular sync: get all files, will filter by cache hash
-            bank_files = iter_bank_files_full()
+            bank_stats = dict(_scan_bank_files())
+            bank_files = list(bank_stats)
             if not bank_files:
                 print(f"No bank files (*.bank.md) under {QUESTION_BANKS_DIR}")
                 return
@@ -1120,7 +1182,7 @@ def main():
     skipped_count = 0
     for path in bank_files:
         # Check if bank needs sync (based on content hash)
-        if not bank_needs_sync(path, bank_cache, force=args.force):
+        if not bank_needs_sync(path, bank_cache, force=args.force, st=bank_stats.get(path)):
             print(f"{path.name} (unchanged, skipping)")
             skipped_count += 1
             continue
@@ -238,8 +238,30 @@ MULTI_ANSWER_RE = re.compile(r"^\s*\[(\*|\s)\]\s*(.*\S)\s*$")
 SHORT_ANSWER_RE = re.compile(r"^\s*\*\s+(.+\S)\s*$")
 TF_TRUE_RE = re.compile(r"^\s*\*a\)\s*True\s*$", re.IGNORECASE)
 TF_FALSE_RE = re.compile(r"^\s*\*b\)\s*False\s*$", re.IGNORECASE)
+TF_TRUE_HINT_RE = re.compile(r"a\)\s*True", re.IGNORECASE)
+TF_FALSE_HINT_RE = re.compile(r"b\)\s*False", re.IGNORECASE)
 INLINE_CODE_RE = re.compile(r"`([^`]+)`")
 
+# Blank-line separators and fenced code regions (which may contain blank
+# lines) in newline-joined quiz text; see split_questions().
+QUESTION_SPLIT_RE = re.compile(
+    r"^[^\S\n]*(?:"
+    r"(?P<fence>(?:```|~~~).*?(?:\n[^\S\n]*(?:```|~~~)[^\n]*|\Z))"
+    r"|(?P<blank>\n|\Z))",
+    re.MULTILINE | re.DOTALL,
+)
+
+# Stem tokens, each starting at the newline before a line: fenced code
+# blocks (through the closing fence, or to the end if unclosed) and blank
+# lines. Text between tokens is paragraph text; see stem_to_html().
+STEM_TOKEN_RE = re.compile(
+    r"\n[^\S\n]*(?:"
+    r"(?P<fence>(?:```|~~~)(?P<lang>[^\n]*)(?:\n(?P<code>.*?))??"
+    r"(?P<close>\n[^\S\n]*(?:```|~~~)[^\n]*|\Z))"
+    r"|(?P<blank>(?=\n|\Z)))",
+    re.DOTALL,
+)
+
 
 def escape_html(text: str) -> str:
     """Escape HTML special characters."""
@@ -248,61 +270,38 @@ def escape_html(text: str) -> str:
 
 def stem_to_html(stem: str) -> str:
     """Convert question stem to HTML with code block support."""
-    lines = stem.split('\n')
+    # Leading newline so the first line starts a token like every other
+    text = "\n" + stem
     result_parts = []
-    current_para = []
-    in_code_block = False
-    code_block_lines = []
-    code_lang = ""
-    
-    def flush_paragraph():
-        nonlocal current_para
-        if current_para:
-            text = ' '.join(current_para)
-            parts = []
-            last_end = 0
-            for match in INLINE_CODE_RE.finditer(text):
-                parts.append(escape_html(text[last_end:match.start()]))
-                parts.append(f'<code>{escape_html(match.group(1))}</code>')
-                last_end = match.end()
-            parts.append(escape_html(text[last_end:]))
-            text = ''.join(parts)
-            result_parts.append(f"<p>{text}</p>")
-            current_para = []
-    
-    for line in lines:
-        stripped = line.strip()
-        
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            if not in_code_block:
-                flush_paragraph()
-                in_code_block = True
-                code_lang = stripped[3:].strip()
-                code_block_lines = []
+    last_end = 0
+
+    def flush_paragraph(end):
+        # Lines between tokens form one paragraph, joined with spaces
+        para = text[last_end + 1:end]
+        if para.strip():
+            para = para.replace("\n", " ")
+            result_parts.append(f"<p>{answer_to_html(para)}</p>")
+
+    for m in STEM_TOKEN_RE.finditer(text):
+        flush_paragraph(m.start())
+        last_end = m.end()
+        if m.lastgroup == "blank":
+            continue
+
+        # An unclosed fence only yields a block if it has content lines
+        code = m.group("code")
+        if m.group("close") or code is not None:
+            code_content = escape_html(code or "")
+            # Unclosed blocks drop the language class
+            code_lang = m.group("lang").strip() if m.group("close") else ""
+            if code_lang:
+                result_parts.append(
+                    f'<pre><code class="language-{escape_html(code_lang)}">{code_content}</code></pre>'
+                )
             else:
-                in_code_block = False
-                code_content = escape_html('\n'.join(code_block_lines))
-                if code_lang:
-                    result_parts.append(
-                        f'<pre><code class="language-{escape_html(code_lang)}">{code_content}</code></pre>'
-                    )
-                else:
-                    result_parts.append(f'<pre><code>{code_content}</code></pre>')
-                code_block_lines = []
-                code_lang = ""
-        elif in_code_block:
-            code_block_lines.append(line)
-        elif not stripped:
-            flush_paragraph()
-        else:
-            current_para.append(line)
-    
-    flush_paragraph()
-    
-    if in_code_block and code_block_lines:
-        code_content = escape_html('\n'.join(code_block_lines))
-        result_parts.append(f'<pre><code>{code_content}</code></pre>')
-    
+                result_parts.append(f'<pre><code>{code_content}</code></pre>')
+
+    flush_paragraph(len(text))
     return '\n'.join(result_parts)
 
 
@@ -320,27 +319,25 @@ def answer_to_html(text: str) -> str:
 
 def split_questions(raw: str) -> List[List[str]]:
     """Split text into question blocks, preserving code blocks."""
-    lines = raw.splitlines()
+    # Normalise line endings the same way str.splitlines() does
+    text = "\n".join(raw.splitlines())
     blocks: List[List[str]] = []
-    cur: List[str] = []
-    in_code_block = False
-
-    def push():
-        nonlocal cur, blocks
-        if cur and any(line.strip() for line in cur):
-            blocks.append(cur)
-        cur = []
-
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            in_code_block = not in_code_block
-            cur.append(line)
-        elif not line.strip() and not in_code_block:
-            push()
-        else:
-            cur.append(line)
-    push()
+    start = 0
+    for m in QUESTION_SPLIT_RE.finditer(text):
+        if m.lastgroup == "fence":
+            # Blank lines inside fenced code do not split; an unclosed
+            # fence runs to the end of the text
+            if m.end() == len(text):
+                break
+            continue
+        if m.start() > start:
+            chunk = text[start:m.start() - 1]  # drop the newline before it
+            if chunk.strip():
+                blocks.append(chunk.split("\n"))
+        start = m.end()
+    chunk = text[start:]
+    if chunk.strip():
+        blocks.append(chunk.split("\n"))
     return blocks
 
 
@@ -356,8 +353,8 @@ def detect_qtype(block: List[str]) -> str:
             return "multiple_answers"
     if any(SHORT_ANSWER_RE.match(line) for line in block):
         return "short_answer"
-    has_true = any(re.search(r"a\)\s*True", line, re.IGNORECASE) for line in block)
-    has_false = any(re.search(r"b\)\s*False", line, re.IGNORECASE) for line in block)
+    has_true = any(TF_TRUE_HINT_RE.search(line) for line in block)
+    has_false = any(TF_FALSE_HINT_RE.search(line) for line in block)
     if has_true and has_false:
         return "true_false"
     return "multiple_choice"
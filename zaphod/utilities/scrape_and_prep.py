@@ -17,18 +17,34 @@ Convert a course codebase into a Zaphod-compatible structure.
 """
 
 import argparse
+import errno
+import functools
 import logging
+import os
 import re
 import shutil
+import time  # for fence timestamps
 from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Callable, Optional, Tuple, List, Union
 import urllib.parse  # URL decoding for %20 etc.
-from datetime import datetime  # for fence timestamps
 
 import frontmatter  # python-frontmatter must be installed [web:87]
 import yaml         # PyYAML for rubric-draft.yaml and topics formatting [web:39]
 
+try:
+    from yaml import CSafeDumper as YamlSafeDumper  # libyaml-backed emitter
+except ImportError:
+    from yaml import SafeDumper as YamlSafeDumper
+
+try:
+    import re2  # google-re2: linear-time matching for the media scanners
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 
 # -----------------------------------------------------------------------------
 # Logging setup with icons
@@ -80,10 +96,10 @@ def fence(label: str) -> None:
     Print a visual fence with a timestamped label.
     Used only at assignment start to bracket logs.
     """
-    ts = datetime.now().strftime("%H:%M:%S")
+    ts = time.strftime("%H:%M:%S")
     print(DOT_LINE)
     print(f"[{ts}] {label}")
-    print("\n")  # extra blank line
+    print()  # extra blank line
 
 
 # -----------------------------------------------------------------------------
@@ -98,21 +114,34 @@ ASSIGNMENT_FILE_PATTERN = re.compile(r"^(\d)-(\d{2})-(.+)\.md$", re.IGNORECASE)
 #   [alt](path)
 #   <img src="path">
 #   <video src="path">
-MARKDOWN_LINK_PATTERN = re.compile(
-    r"""
-    (?:!\[.*?\]\((?P<img_md>[^)]+)\))      # Markdown image ![alt](path)
-    |(?:\[[^\]]*\]\((?P<link_md>[^)]+)\))  # Markdown link [text](path)
-    |(?:<img[^>]+src=["'](?P<img_html>[^"']+)["'])      # <img src="path">
-    |(?:<video[^>]+src=["'](?P<video_html>[^"']+)["'])  # <video src="path">
-    """,
-    re.VERBOSE | re.IGNORECASE,
+#
+# Spelled flat with inline flags (no VERBOSE) so the same source compiles
+# under both re and re2.
+MEDIA_LINK_SOURCE = (
+    r"(?i)"
+    r"(?:!\[.*?\]\((?P<img_md>[^)]+)\))"                      # ![alt](path)
+    r"|(?:\[[^\]]*\]\((?P<link_md>[^)]+)\))"                  # [text](path)
+    r"""|(?:<img[^>]+src=["'](?P<img_html>[^"']+)["'])"""      # <img src="path">
+    r"""|(?:<video[^>]+src=["'](?P<video_html>[^"']+)["'])"""  # <video src="path">
 )
+MARKDOWN_LINK_PATTERN = re.compile(MEDIA_LINK_SOURCE)
 
 # Generic attribute capture: src="...", file="...", poster="..."
-GENERIC_ATTR_PATTERN = re.compile(
-    r"""\b(?P<attr>src|file|poster)\s*=\s*["'](?P<attr_value>[^"']+)["']""",
-    re.IGNORECASE | re.DOTALL,
+GENERIC_ATTR_SOURCE = (
+    r"""(?is)\b(?P<attr>src|file|poster)\s*=\s*["'](?P<attr_value>[^"']+)["']"""
 )
+GENERIC_ATTR_PATTERN = re.compile(GENERIC_ATTR_SOURCE)
+
+# find_media_paths scans every body with both patterns; RE2 runs them in
+# linear time with no backtracking on pathological markdown. RE2's \b is
+# ASCII-only, so an attribute name glued to a non-ASCII letter (e.g. "ésrc=")
+# also matches there, which real markup never relies on.
+if RE2_AVAILABLE:
+    MEDIA_LINK_SCANNER = re2.compile(MEDIA_LINK_SOURCE)
+    MEDIA_ATTR_SCANNER = re2.compile(GENERIC_ATTR_SOURCE)
+else:
+    MEDIA_LINK_SCANNER = MARKDOWN_LINK_PATTERN
+    MEDIA_ATTR_SCANNER = GENERIC_ATTR_PATTERN
 
 # For replacing <video-card> blocks
 VIDEO_CARD_PATTERN = re.compile(
@@ -125,15 +154,24 @@ VIDEO_CARD_PATTERN = re.compile(
     re.IGNORECASE | re.VERBOSE | re.DOTALL,
 )
 
+# key="value" / key='value' pairs inside a <video-card ...> opening tag
+VIDEO_CARD_ATTR_PATTERN = re.compile(
+    r"""\b(?P<key>\w+)\s*=\s*["'](?P<value>[^"']*)["']""",
+    re.IGNORECASE | re.DOTALL,
+)
+
 # For extracting rubric blocks
 RUBRIC_BLOCK_PATTERN = re.compile(
     r"###\s+Rubric\s*?\n\s*?<accordion-list>(?P<body>.*?)</accordion-list>",
     re.IGNORECASE | re.DOTALL,
 )
 
+# "###### label" heading lines; splitting on these (with the label captured)
+# yields [preamble, label, text, label, text, ...] in one linear pass. A bare
+# trailing "######" ends the previous level's text but splits with label None.
 RUBRIC_LEVEL_PATTERN = re.compile(
-    r"^######\s+(?P<label>.+?)\s*$\s*(?P<text>.*?)(?=^######\s+|\Z)",
-    re.IGNORECASE | re.DOTALL | re.MULTILINE,
+    r"^######(?:\s+(.+?)\s*$|\s+\Z)",
+    re.DOTALL | re.MULTILINE,
 )
 
 # For replacing <slt-buttons> ... file-download</slt-buttons>
@@ -146,6 +184,9 @@ SLT_BUTTON_PATTERN = re.compile(
     re.VERBOSE,
 )
 
+# Replacement for a matched <slt-buttons> block (no backreferences)
+SLT_BUTTON_MARKDOWN = '[Download PDF](/path/to/file.pdf){: .button .file-download}'
+
 # Media mapping constants
 LEGACY_VIDEO_PREFIX = "../../../VIDEOS/dd/"
 NEW_VIDEO_PREFIX = "photoshop/Photoshop 30/"
@@ -153,12 +194,39 @@ TOPICS_PREFIX = "../topics/"
 VIDEO_DIR_NAME = "videos"
 ASSETS_PREFIX = "assets/"
 
+# Reference prefixes that map under topics_root, tried in order:
+#   (prefix, subdir under topics_root, keep prefix in the mapped path,
+#    on a miss continue with the prefix stripped, debug message)
+# ../../../VIDEOS/dd/...        -> topics_root/videos/...
+# photoshop/Photoshop 30/...    -> topics_root/videos/photoshop/Photoshop 30/...
+# ../topics/...                 -> topics_root/...
+TOPICS_PREFIX_RULES: Tuple[Tuple[str, str, bool, bool, str], ...] = (
+    (LEGACY_VIDEO_PREFIX, VIDEO_DIR_NAME, False, True, "Mapped legacy video reference '%s' → %s"),
+    (NEW_VIDEO_PREFIX, VIDEO_DIR_NAME, True, False, "Mapped new video reference '%s' → %s"),
+    (TOPICS_PREFIX, "", False, False, "Resolved topics media '%s' → %s"),
+)
+
+# Bytes requested per copy_file_range call when copying media
+COPY_CHUNK_BYTES = 1 << 30
+
+# copy_file_range errors that mean "not supported here", not a real failure
+_COPY_RANGE_FALLBACK_ERRNOS = frozenset(
+    {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM}
+)
+
+# Threads overlapping media copies/moves within one assignment
+MEDIA_COPY_WORKERS = 8
+
+# Worker processes for the per-assignment compute phase
+ASSIGNMENT_WORKERS = os.cpu_count() or 1
+ASSIGNMENT_CHUNKSIZE = 4
+
 
 # -----------------------------------------------------------------------------
 # Small helpers
 # -----------------------------------------------------------------------------
 
-def is_course_dir(path: Path) -> bool:
+def is_course_dir(path: Union[Path, os.DirEntry]) -> bool:
     return COURSE_DIR_PATTERN.match(path.name) is not None
 
 
@@ -199,10 +267,83 @@ def _safe_is_file(path: Path) -> bool:
         return False
 
 
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy src to dst with metadata, like shutil.copy2.
+
+    Tries os.copy_file_range first (Linux), which stays in the kernel and
+    reflinks on btrfs/XFS so large videos copy in metadata time. Falls back to
+    shutil.copyfile, which itself uses sendfile/fcopyfile where available.
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    copied = False
+    if copy_file_range is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+                while copy_file_range(in_fd, out_fd, COPY_CHUNK_BYTES):
+                    pass
+            copied = True
+        except OSError as e:
+            if e.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                raise
+    if not copied:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _symlink(target: Path, link_path: Path) -> None:
+    link_path.symlink_to(target)
+
+
+def _hardlink(target: Path, link_path: Path) -> None:
+    os.link(target, link_path)
+
+
+def _pick_link_impl(directory: Path) -> Tuple[str, Callable[[Path, Path], None]]:
+    """
+    Probe once which kind of link can be created in directory.
+
+    Symlinks need developer mode or admin rights on Windows; hard links work
+    on any NTFS volume; a copy works everywhere.
+
+    Returns (method name for log messages, function(target, link_path)).
+    """
+    probe_target = directory / f".link-probe-{os.getpid()}"
+    probe_link = directory / f".link-probe-{os.getpid()}.lnk"
+    try:
+        try:
+            os.symlink(probe_target.name, probe_link)
+            return "symlink", _symlink
+        except (OSError, NotImplementedError):
+            pass
+        try:
+            probe_target.touch()
+            os.link(probe_target, probe_link)
+            logging.warning(
+                "Symlinks unavailable in %s; linking shared media with hard links",
+                directory,
+            )
+            return "hard link", _hardlink
+        except (OSError, NotImplementedError):
+            logging.warning(
+                "Links unavailable in %s; copying shared media into each assignment",
+                directory,
+            )
+            return "copy", _fast_copy
+    finally:
+        for probe in (probe_link, probe_target):
+            try:
+                os.unlink(probe)
+            except OSError:
+                pass
+
+
 # -----------------------------------------------------------------------------
 # Markdown and content transformations (pure functions)
 # -----------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=4096)
 def _strip_markdown_title(reference: str) -> str:
     """
     Remove any markdown link title or trailing quoted text from a URL/path.
@@ -223,57 +364,61 @@ def _strip_markdown_title(reference: str) -> str:
     return ref
 
 
+# Shared assets are referenced by the same string from many assignments
+_unquote = functools.lru_cache(maxsize=4096)(urllib.parse.unquote)
+
+
 def _parse_video_card_attrs(attrs: str) -> dict:
     """
     Parse attributes from a <video-card ...> tag into a dict.
     """
-    attr_pattern = re.compile(
-        r"""\b(?P<key>\w+)\s*=\s*["'](?P<value>[^"']*)["']""",
-        re.IGNORECASE | re.DOTALL,
-    )
     out: dict[str, str] = {}
-    for m in attr_pattern.finditer(attrs):
+    for m in VIDEO_CARD_ATTR_PATTERN.finditer(attrs):
         key = m.group("key").lower()
         value = m.group("value")
         out[key] = value
     return out
 
 
-def transform_video_cards(markdown_text: str) -> str:
+def _video_card_html(match: re.Match) -> str:
     """
-    Replace custom <video-card ...>...</video-card> blocks with standard HTML5 video markup.
+    Render one matched <video-card> block as HTML5 video markup.
     """
+    attrs_str = match.group("attrs") or ""
+    attrs = _parse_video_card_attrs(attrs_str)
+
+    file_path = (attrs.get("file") or "").strip()
+    topic = (attrs.get("topic") or "").strip()
+    time_str = (attrs.get("time") or "").strip()
+    poster = (attrs.get("poster") or "").strip()
+
+    caption_parts = []
+    if topic:
+        caption_parts.append(topic)
+    if time_str:
+        caption_parts.append(f"({time_str})")
+    caption = " ".join(caption_parts)
+
+    poster_attr = f' poster="{poster}"' if poster else ""
+    video_html_lines = [
+        '<figure class="video-card">',
+        f"  <video controls{poster_attr}>",
+        f'    <source src="{file_path}" type="video/mp4">',
+        "    Your browser does not support the video tag.",
+        "  </video>",
+    ]
+    if caption:
+        video_html_lines.append(f"  <figcaption>{caption}</figcaption>")
+    video_html_lines.append("</figure>")
 
-    def _repl(match: re.Match) -> str:
-        attrs_str = match.group("attrs") or ""
-        attrs = _parse_video_card_attrs(attrs_str)
-
-        file_path = (attrs.get("file") or "").strip()
-        topic = (attrs.get("topic") or "").strip()
-        time_str = (attrs.get("time") or "").strip()
-        poster = (attrs.get("poster") or "").strip()
-
-        caption_parts = []
-        if topic:
-            caption_parts.append(topic)
-        if time_str:
-            caption_parts.append(f"({time_str})")
-        caption = " ".join(caption_parts)
-
-        video_html_lines = [
-            '<figure class="video-card">',
-            f'  <video controls{f" poster=\"{poster}\"" if poster else ""}>',
-            f'    <source src="{file_path}" type="video/mp4">',
-            "    Your browser does not support the video tag.",
-            "  </video>",
-        ]
-        if caption:
-            video_html_lines.append(f"  <figcaption>{caption}</figcaption>")
-        video_html_lines.append("</figure>")
+    return "\n".join(video_html_lines)
 
-        return "\n".join(video_html_lines)
 
-    return VIDEO_CARD_PATTERN.sub(_repl, markdown_text)
+def transform_video_cards(markdown_text: str) -> str:
+    """
+    Replace custom <video-card ...>...</video-card> blocks with standard HTML5 video markup.
+    """
+    return VIDEO_CARD_PATTERN.sub(_video_card_html, markdown_text)
 
 
 def transform_slt_buttons(markdown_text: str) -> str:
@@ -281,11 +426,18 @@ def transform_slt_buttons(markdown_text: str) -> str:
     Replace <slt-buttons>[Get Lesson Files](...) | file-download</slt-buttons>
     with a standard markdown button-style link.
     """
+    return SLT_BUTTON_PATTERN.sub(SLT_BUTTON_MARKDOWN, markdown_text)
 
-    def _repl(_: re.Match) -> str:
-        return '[Download PDF](/path/to/file.pdf){: .button .file-download}'
 
-    return SLT_BUTTON_PATTERN.sub(_repl, markdown_text)
+def _parse_points(range_part: str) -> int:
+    """
+    Map a level's range label ("8-9", "5", "") to points: the upper end of
+    the numeric range, or 0 when it is not numeric.
+    """
+    try:
+        return int(range_part.rpartition("-")[2])
+    except ValueError:
+        return 0
 
 
 def extract_rubric(markdown_text: str) -> tuple[Optional[dict], str]:
@@ -301,9 +453,12 @@ def extract_rubric(markdown_text: str) -> tuple[Optional[dict], str]:
     body = m.group("body")
     criteria: List[dict] = []
 
-    for level_match in RUBRIC_LEVEL_PATTERN.finditer(body):
-        label = level_match.group("label").strip()  # e.g. "8-9: Achieving"
-        text = level_match.group("text").strip()
+    parts = RUBRIC_LEVEL_PATTERN.split(body)
+    for label, text in zip(parts[1::2], parts[2::2]):
+        if label is None:
+            continue
+        label = label.strip()  # e.g. "8-9: Achieving"
+        text = text.strip()
         description = " ".join(text.split())  # collapse whitespace
 
         if ":" in label:
@@ -311,18 +466,7 @@ def extract_rubric(markdown_text: str) -> tuple[Optional[dict], str]:
         else:
             range_part, short_desc = "", label
 
-        # Points mapping: use the upper end of the numeric range
-        max_points = 0
-        if "-" in range_part:
-            try:
-                max_points = int(range_part.split("-")[-1])
-            except ValueError:
-                max_points = 0
-        else:
-            try:
-                max_points = int(range_part)
-            except ValueError:
-                max_points = 0
+        max_points = _parse_points(range_part)
 
         criteria.append(
             {
@@ -359,7 +503,7 @@ def find_media_paths(markdown_text: str) -> List[str]:
     # Normalize whitespace early to reduce odd captures
     text = markdown_text.replace("\r\n", "\n")
 
-    for match in MARKDOWN_LINK_PATTERN.finditer(text):
+    for match in MEDIA_LINK_SCANNER.finditer(text):
         group_dict = match.groupdict()
         for key in ["img_md", "link_md", "img_html", "video_html"]:
             val = group_dict.get(key)
@@ -371,7 +515,7 @@ def find_media_paths(markdown_text: str) -> List[str]:
                 continue
             paths.append(val)
 
-    for match in GENERIC_ATTR_PATTERN.finditer(text):
+    for match in MEDIA_ATTR_SCANNER.finditer(text):
         val = match.group("attr_value")
         val = clean_quotes(val)
         val = _strip_markdown_title(val)
@@ -394,8 +538,9 @@ def _format_topics_block(topics_value) -> List[str]:
       - Color
       - adjustment layers
     """
-    dumped = yaml.safe_dump(
+    dumped = yaml.dump(
         {"topics": topics_value},
+        Dumper=YamlSafeDumper,
         sort_keys=False,
         allow_unicode=True,
         default_flow_style=False,
@@ -412,12 +557,26 @@ def build_zaphod_frontmatter(
     """
     Build the Zaphod-compatible YAML frontmatter as a string.
     """
-    display_name = base_name.replace("-", " ").title()
+    return "".join(
+        _zaphod_frontmatter_parts(module_num, order_num, base_name, original_meta)
+    )
+
+
+# (module_num, imported lines, repr(topics)) -> frontmatter after the name line
+_FRONTMATTER_BLOCK_CACHE: dict[tuple, str] = {}
+
+
+def _frontmatter_block(
+    module_num: str,
+    imported_lines: Tuple[str, ...],
+    original_meta: Optional[dict],
+) -> str:
+    """
+    Build the frontmatter from the type line through the closing "---".
+    """
     module_label = f"Credit {module_num}"
 
     frontmatter_lines = [
-        "---",
-        f'name: "{display_name}"',
         'type: "Assignment"',
         "modules:",
         f'  - "{module_label}"',
@@ -436,67 +595,105 @@ def build_zaphod_frontmatter(
         "group_category: null",
     ]
 
+    if imported_lines:
+        frontmatter_lines.append("")
+        frontmatter_lines.append("# imported")
+        frontmatter_lines.extend(imported_lines)
+
+    # topics as an active, block-style YAML key if present
+    if original_meta and "topics" in original_meta:
+        frontmatter_lines.append("")
+        frontmatter_lines.extend(_format_topics_block(original_meta["topics"]))
+
+    frontmatter_lines.append("---")
+    frontmatter_lines.append("")
+
+    return "\n".join(frontmatter_lines)
+
+
+def _zaphod_frontmatter_parts(
+    module_num: str,
+    order_num: str,
+    base_name: str,
+    original_meta: Optional[dict] = None,
+) -> List[str]:
+    """
+    Build the Zaphod frontmatter as a list of text pieces, joined once by the caller.
+    """
+    display_name = base_name.replace("-", " ").title()
+
     surfaced_keys = ("duration", "credit", "order")
 
+    imported_lines: Tuple[str, ...] = ()
+    topics_key: Optional[str] = None
     if original_meta:
-        imported_lines: List[str] = []
-        for key in surfaced_keys:
-            if key in original_meta:
-                imported_lines.append(f"{key}: {original_meta[key]}")
-        if imported_lines:
-            frontmatter_lines.append("")
-            frontmatter_lines.append("# imported")
-            frontmatter_lines.extend(imported_lines)
-
-        # topics as an active, block-style YAML key if present
+        imported_lines = tuple(
+            f"{key}: {original_meta[key]}" for key in surfaced_keys if key in original_meta
+        )
         if "topics" in original_meta:
-            frontmatter_lines.append("")
-            frontmatter_lines.extend(_format_topics_block(original_meta["topics"]))
+            topics_key = repr(original_meta["topics"])
 
-    frontmatter_lines.append("---")
-    frontmatter_lines.append("")
+    # Everything after the name line depends only on the module and the
+    # surfaced/topics values, which many assignments share
+    cache_key = (module_num, imported_lines, topics_key)
+    block = _FRONTMATTER_BLOCK_CACHE.get(cache_key)
+    if block is None:
+        block = _frontmatter_block(module_num, imported_lines, original_meta)
+        _FRONTMATTER_BLOCK_CACHE[cache_key] = block
 
-    fm_text = "\n".join(frontmatter_lines)
+    parts = [f'---\nname: "{display_name}"\n', block]
 
     # Comment out remaining original frontmatter, excluding imported keys and topics
     if original_meta:
-        fm_text += "# Original frontmatter (commented out):\n"
+        parts.append("# Original frontmatter (commented out):\n")
         for key, value in original_meta.items():
             if key in surfaced_keys:
                 continue
             if key == "topics":
                 continue
-            fm_text += f"# {key}: {value}\n"
-        fm_text += "\n"
+            parts.append(f"# {key}: {value}\n")
+        parts.append("\n")
 
-    return fm_text
+    return parts
 
 
-def create_index_md(
-    dest_assignment_dir: Path,
+def build_index_text(
     module_num: str,
     order_num: str,
     base_name: str,
     original_metadata: Optional[dict],
     original_content: str,
-) -> None:
+) -> str:
     """
-    Create the index.md file with Zaphod frontmatter, commented original frontmatter, and original content.
+    Build the index.md text: Zaphod frontmatter, commented original frontmatter, and original content.
     """
-    dest_assignment_dir.mkdir(parents=True, exist_ok=True)
-    index_path = dest_assignment_dir / "index.md"
-
-    fm_text = build_zaphod_frontmatter(
+    parts = _zaphod_frontmatter_parts(
         module_num=module_num,
         order_num=order_num,
         base_name=base_name,
         original_meta=original_metadata,
     )
+    parts.append(original_content)
+    return "".join(parts)
 
-    to_write = fm_text + original_content
 
-    with index_path.open("w", encoding="utf-8") as f:
-        f.write(to_write)
+def create_index_md(dest_assignment_dir: Path, index_text: str) -> None:
+    """
+    Write a prepared index.md into the assignment folder.
+    """
+    dest_assignment_dir.mkdir(parents=True, exist_ok=True)
+    index_path = dest_assignment_dir / "index.md"
+
+    # One encode and a raw descriptor write; no text-layer buffering
+    data = index_text.encode("utf-8")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(index_path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
     logging.info("  - Created index.md")
 
@@ -516,6 +713,7 @@ class MediaResolver:
         topics_root: Optional[Path],
         course_id: str,
         dest_course_dir: Path,
+        probe_cache: Optional[dict[Path, tuple[Path, bool]]] = None,
     ) -> None:
         self.course_root = course_root
         self.topics_root = topics_root
@@ -528,10 +726,52 @@ class MediaResolver:
         self._in_assets: dict[str, Path] = {}
         # list of (source_file, last_candidate_path)
         self.missing_media: list[tuple[Path, Path]] = []
+        # raw candidate path -> (resolved path, is a regular file); may be
+        # shared between resolvers so topics/ probes happen once per run
+        self._probe_cache: dict[Path, tuple[Path, bool]] = (
+            {} if probe_cache is None else probe_cache
+        )
+        # source file -> its course directory (source_file.parents[1])
+        self._course_dirs: dict[Path, Path] = {}
+        # destination directory -> names of entries known to exist in it
+        self._dir_names: dict[Path, set[str]] = {}
 
         self._assets_dir = self.dest_course_dir / "assets"
         self._assets_dir.mkdir(parents=True, exist_ok=True)
 
+        # How shared media is linked into assignments: symlink where the
+        # platform allows it, else hard link, else a plain copy
+        self._link_kind, self._link_impl = _pick_link_impl(self._assets_dir)
+
+    def _probe(self, candidate: Path) -> tuple[Path, bool]:
+        """
+        Resolve a candidate path and check it is a regular file.
+
+        Source trees do not change during a run, so each distinct candidate is
+        resolved and stat'ed once per cache. Concurrent courses sharing the
+        cache at worst probe the same path twice, so no lock is taken.
+        """
+        try:
+            return self._probe_cache[candidate]
+        except KeyError:
+            pass
+        resolved = candidate.resolve()
+        probe = (resolved, _safe_is_file(resolved))
+        self._probe_cache[candidate] = probe
+        return probe
+
+    def _course_dir_for(self, source_file: Path) -> Path:
+        try:
+            return self._course_dirs[source_file]
+        except KeyError:
+            pass
+        try:
+            course_dir = source_file.parents[1]
+        except IndexError:
+            course_dir = self.course_root
+        self._course_dirs[source_file] = course_dir
+        return course_dir
+
     def resolve_media_path(
         self,
         reference: str,
@@ -546,7 +786,7 @@ class MediaResolver:
         reference = _strip_markdown_title(reference)
 
         # Decode %20 etc.
-        reference = urllib.parse.unquote(reference)
+        reference = _unquote(reference)
 
         # Strip <...> wrapper if present, e.g. <../topics/...>
         if reference.startswith("<") and reference.endswith(">"):
@@ -557,63 +797,33 @@ class MediaResolver:
 
         last_candidate: Optional[Path] = None
 
-        # Legacy video paths: ../../../VIDEOS/dd/...  -> topics_root/videos/...
-        if self.topics_root is not None and reference.startswith(LEGACY_VIDEO_PREFIX):
-            remainder = reference[len(LEGACY_VIDEO_PREFIX) :]
-            candidate = (self.topics_root / VIDEO_DIR_NAME / remainder).resolve()
-            last_candidate = candidate
-            if _safe_is_file(candidate):
-                logging.debug(
-                    "Mapped legacy video reference '%s' → %s",
-                    reference,
-                    candidate,
-                )
-                return candidate
-            reference = remainder
-
-        # New video paths: photoshop/Photoshop 30/... -> topics_root/videos/photoshop/Photoshop 30/...
-        if self.topics_root is not None and reference.startswith(NEW_VIDEO_PREFIX):
-            candidate = (self.topics_root / VIDEO_DIR_NAME / reference).resolve()
-            last_candidate = candidate
-            if _safe_is_file(candidate):
-                logging.debug(
-                    "Mapped new video reference '%s' → %s",
-                    reference,
-                    candidate,
-                )
-                return candidate
-
-        # Shared topics paths: ../topics/... → topics_root/...
-        if self.topics_root is not None and reference.startswith(TOPICS_PREFIX):
-            rel_under_topics = reference[len(TOPICS_PREFIX) :]
-            candidate = (self.topics_root / rel_under_topics).resolve()
-            last_candidate = candidate
-            if _safe_is_file(candidate):
-                logging.debug(
-                    "Resolved topics media '%s' → %s",
-                    reference,
-                    candidate,
-                )
-                return candidate
+        if self.topics_root is not None:
+            for prefix, subdir, keep_prefix, strip_on_miss, message in TOPICS_PREFIX_RULES:
+                if not reference.startswith(prefix):
+                    continue
+                rel = reference if keep_prefix else reference[len(prefix) :]
+                candidate, is_file = self._probe(self.topics_root / subdir / rel)
+                last_candidate = candidate
+                if is_file:
+                    logging.debug(message, reference, candidate)
+                    return candidate
+                if strip_on_miss:
+                    reference = rel
 
         candidates: List[Path] = []
 
-        try:
-            course_dir = source_file.parents[1]
-        except IndexError:
-            course_dir = self.course_root
-
         # Strict: assets/ only inside the local course
         if reference.startswith(ASSETS_PREFIX):
-            candidates.append((course_dir / reference).resolve())
+            candidates.append(self._course_dir_for(source_file) / reference)
         else:
             # Other relatives: source file dir, then overall course_root
-            candidates.append((source_file.parent / reference).resolve())
-            candidates.append((self.course_root / reference).resolve())
+            candidates.append(source_file.parent / reference)
+            candidates.append(self.course_root / reference)
 
-        for candidate in candidates:
+        for raw_candidate in candidates:
+            candidate, is_file = self._probe(raw_candidate)
             last_candidate = candidate
-            if _safe_is_file(candidate):
+            if is_file:
                 logging.debug("Resolved media '%s' → %s", reference, candidate)
                 return candidate
 
@@ -638,246 +848,360 @@ class MediaResolver:
 
         Per-assignment de-dup:
           - Copy/symlink at most once per basename into that assignment folder.
+
+        Work is planned first without touching the destination, then run in
+        phases: first-time copies, then promotions into assets/ (which may
+        move a copy made in the first phase), both on a thread pool, and
+        finally symlinks, serially.
         """
+        seen_once = dict(self._seen_once)
+        in_assets = dict(self._in_assets)
+        names = self._names_in(dest_assignment_dir)
+
+        # (basename, src, dest_path)
+        copies: List[Tuple[str, Path, Path]] = []
+        # (basename, src, first_assignment_file, asset_target, move_first_copy)
+        promotions: List[Tuple[str, Path, Path, Path, bool]] = []
+        # (basename, link_path, target)
+        links: List[Tuple[str, Path, Path]] = []
+
         for ref in media_paths:
             src = self.resolve_media_path(ref, source_file)
             if not src:
                 continue
 
             basename = src.name
-            asset_target = self._assets_dir / basename
 
             # If it's already in assets, just ensure this assignment has a symlink.
-            if basename in self._in_assets:
+            if basename in in_assets:
                 logging.debug(
                     "Shared media '%s' already in assets at %s",
                     basename,
-                    self._in_assets[basename],
+                    in_assets[basename],
                 )
-                link_path = dest_assignment_dir / basename
-                if not link_path.exists():
-                    try:
-                        link_path.symlink_to(self._in_assets[basename])
-                        logging.debug(
-                            "Created symlink for '%s' in %s -> %s",
-                            basename,
-                            link_path,
-                            self._in_assets[basename],
-                        )
-                    except OSError as e:
-                        logging.error(
-                            "Failed to create symlink '%s' -> '%s': %s",
-                            link_path,
-                            self._in_assets[basename],
-                            e,
-                        )
+                links.append((basename, dest_assignment_dir / basename, in_assets[basename]))
                 continue
 
             # First time we see this basename in the course.
-            if basename not in self._seen_once:
-                dest_path = dest_assignment_dir / basename
-                try:
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    if not dest_path.exists():
-                        shutil.copy2(src, dest_path)
-                        logging.debug(
-                            "Copied unique media '%s' into assignment %s",
-                            basename,
-                            dest_assignment_dir,
-                        )
-                    self._seen_once[basename] = dest_assignment_dir
-                except Exception as e:
-                    logging.error(
-                        "Failed to copy media '%s' to '%s': %s",
-                        src,
-                        dest_path,
-                        e,
-                    )
+            if basename not in seen_once:
+                if basename not in names:
+                    copies.append((basename, src, dest_assignment_dir / basename))
+                    names.add(basename)
+                seen_once[basename] = dest_assignment_dir
                 continue
 
-            # Second (or later) time we see this basename:
+            # Second time we see this basename:
             #  - move/copy into assets/
             #  - replace first assignment copy with a symlink
             #  - create a symlink in the current assignment
-            first_assignment_dir = self._seen_once[basename]
-            first_assignment_file = first_assignment_dir / basename
-
-            if first_assignment_file.exists():
-                try:
-                    shutil.move(str(first_assignment_file), str(asset_target))
-                    logging.debug(
-                        "Moved media '%s' from %s to course assets: %s",
-                        basename,
-                        first_assignment_file,
-                        asset_target,
-                    )
-                except Exception as e:
-                    logging.error(
-                        "Failed to move '%s' to assets '%s': %s",
-                        first_assignment_file,
-                        asset_target,
-                        e,
-                    )
+            first_assignment_dir = seen_once.pop(basename)
+            first_names = self._names_in(first_assignment_dir)
+            asset_target = self._assets_dir / basename
+            promotions.append(
+                (
+                    basename,
+                    src,
+                    first_assignment_dir / basename,
+                    asset_target,
+                    basename in first_names,
+                )
+            )
+            first_names.discard(basename)
+            links.append((basename, first_assignment_dir / basename, asset_target))
+            links.append((basename, dest_assignment_dir / basename, asset_target))
+            in_assets[basename] = asset_target
+
+        if copies:
+            dest_assignment_dir.mkdir(parents=True, exist_ok=True)
+        for (basename, src, dest_path), error in zip(
+            copies, self._run_io(self._copy_unique, copies)
+        ):
+            if error is None:
+                logging.debug(
+                    "Copied unique media '%s' into assignment %s",
+                    basename,
+                    dest_assignment_dir,
+                )
+                continue
+            logging.error(
+                "Failed to copy media '%s' to '%s': %s",
+                src,
+                dest_path,
+                error,
+            )
+            names.discard(basename)
+            if seen_once.get(basename) == dest_assignment_dir:
+                del seen_once[basename]
+
+        for (basename, src, first_file, asset_target, moved), error in zip(
+            promotions, self._run_io(self._promote_to_assets, promotions)
+        ):
+            if error is None and moved:
+                logging.debug(
+                    "Moved media '%s' from %s to course assets: %s",
+                    basename,
+                    first_file,
+                    asset_target,
+                )
+            elif error is None:
+                logging.debug(
+                    "Copied media '%s' directly to course assets: %s",
+                    basename,
+                    asset_target,
+                )
+            elif moved:
+                logging.error(
+                    "Failed to move '%s' to assets '%s': %s",
+                    first_file,
+                    asset_target,
+                    error,
+                )
+                # The first copy is still in place; leave it there
+                self._names_in(first_file.parent).add(basename)
             else:
-                try:
-                    shutil.copy2(src, asset_target)
-                    logging.debug(
-                        "Copied media '%s' directly to course assets: %s",
-                        basename,
-                        asset_target,
-                    )
-                except Exception as e:
-                    logging.error(
-                        "Failed to copy media '%s' to '%s': %s",
-                        src,
-                        asset_target,
-                        e,
-                    )
-
-            # Symlink back into the first assignment folder
-            first_link = first_assignment_dir / basename
-            if not first_link.exists():
-                try:
-                    first_link.symlink_to(asset_target)
-                    logging.debug(
-                        "Created symlink for '%s' in %s -> %s",
-                        basename,
-                        first_link,
-                        asset_target,
-                    )
-                except OSError as e:
-                    logging.error(
-                        "Failed to create symlink '%s' -> '%s': %s",
-                        first_link,
-                        asset_target,
-                        e,
-                    )
-
-            # Symlink into the current assignment folder
-            current_link = dest_assignment_dir / basename
-            if not current_link.exists():
-                try:
-                    current_link.symlink_to(asset_target)
-                    logging.debug(
-                        "Created symlink for '%s' in %s -> %s",
-                        basename,
-                        current_link,
-                        asset_target,
-                    )
-                except OSError as e:
-                    logging.error(
-                        "Failed to create symlink '%s' -> '%s': %s",
-                        current_link,
-                        asset_target,
-                        e,
-                    )
-
-            self._in_assets[basename] = asset_target
-            del self._seen_once[basename]
+                logging.error(
+                    "Failed to copy media '%s' to '%s': %s",
+                    src,
+                    asset_target,
+                    error,
+                )
+
+        for basename, link_path, target in links:
+            link_names = self._names_in(link_path.parent)
+            if basename in link_names:
+                continue
+            try:
+                self._link_impl(target, link_path)
+                link_names.add(basename)
+                logging.debug(
+                    "Created %s for '%s' in %s -> %s",
+                    self._link_kind,
+                    basename,
+                    link_path,
+                    target,
+                )
+            except OSError as e:
+                logging.error(
+                    "Failed to create %s '%s' -> '%s': %s",
+                    self._link_kind,
+                    link_path,
+                    target,
+                    e,
+                )
+
+        self._seen_once = seen_once
+        self._in_assets = in_assets
+
+    def _names_in(self, directory: Path) -> set[str]:
+        """
+        Return the tracked set of entry names in a destination directory.
+
+        Each directory is listed once with os.scandir and the set is then kept
+        up to date as media is copied, moved and linked, so existence checks
+        are set lookups rather than a stat per reference.
+        """
+        try:
+            return self._dir_names[directory]
+        except KeyError:
+            pass
+        try:
+            with os.scandir(directory) as it:
+                found = {entry.name for entry in it}
+        except FileNotFoundError:
+            found = set()
+        self._dir_names[directory] = found
+        return found
+
+    @staticmethod
+    def _run_io(fn: Callable, jobs: list) -> list:
+        """
+        Run fn(*job) for each job, overlapping the I/O on a thread pool when
+        there is more than one job. Results come back in job order.
+        """
+        if len(jobs) <= 1:
+            return [fn(*job) for job in jobs]
+        workers = min(MEDIA_COPY_WORKERS, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda job: fn(*job), jobs))
+
+    @staticmethod
+    def _copy_unique(
+        basename: str, src: Path, dest_path: Path
+    ) -> Optional[Exception]:
+        """Copy a first-seen media file into its assignment folder."""
+        try:
+            _fast_copy(src, dest_path)
+        except Exception as e:
+            return e
+        return None
+
+    @staticmethod
+    def _promote_to_assets(
+        basename: str, src: Path, first_file: Path, asset_target: Path, moved: bool
+    ) -> Optional[Exception]:
+        """
+        Move the first assignment's copy into assets/, or copy from the source
+        when that copy is gone.
+        """
+        try:
+            if moved:
+                shutil.move(str(first_file), str(asset_target))
+            else:
+                _fast_copy(src, asset_target)
+        except Exception as e:
+            return e
+        return None
 
 
 # -----------------------------------------------------------------------------
 # High-level processing
 # -----------------------------------------------------------------------------
 
-def load_markdown_with_frontmatter(md_path: Path) -> tuple[Optional[dict], str]:
+LogFn = Callable[..., None]
+
+
+def load_markdown_with_frontmatter(
+    md_path: Path, log: LogFn = logging.log
+) -> tuple[Optional[dict], str]:
     """
     Load a markdown file, returning (frontmatter_dict_or_None, content).
     """
+    # Read and decode once; the no-frontmatter fallback reuses the same text
+    try:
+        text = md_path.read_bytes().decode("utf-8")
+    except Exception as e:
+        log(logging.ERROR, "Failed to read markdown file %s: %s", md_path, e)
+        return None, ""
+
     try:
-        post = frontmatter.load(md_path)
+        post = frontmatter.loads(text)
         original_metadata = dict(post.metadata) if post.metadata else None
         content = post.content
-        logging.info("  - Parsed frontmatter and content")
+        log(logging.INFO, "  - Parsed frontmatter and content")
         return original_metadata, content
     except Exception as e:
-        logging.error("Failed to parse frontmatter for %s: %s", md_path, e)
-        try:
-            content = md_path.read_text(encoding="utf-8")
-            logging.info("  - Loaded content without frontmatter")
-            return None, content
-        except Exception as e2:
-            logging.error("Failed to read markdown file %s: %s", md_path, e2)
-            return None, ""
+        log(logging.ERROR, "Failed to parse frontmatter for %s: %s", md_path, e)
+        log(logging.INFO, "  - Loaded content without frontmatter")
+        return None, text
 
 
-def transform_assignment_content(content: str) -> tuple[Optional[dict], str]:
+def transform_assignment_content(
+    content: str, log: LogFn = logging.log
+) -> tuple[Optional[dict], str]:
     """
     Apply rubric extraction and content transforms to assignment body.
     Returns (rubric_dict_or_None, transformed_content).
     """
     rubric, body = extract_rubric(content)
     if rubric:
-        logging.info("  - Extracted rubric")
+        log(logging.INFO, "  - Extracted rubric")
 
     body = transform_video_cards(body)
-    logging.info("  - Transformed video cards")
+    log(logging.INFO, "  - Transformed video cards")
 
     body = transform_slt_buttons(body)
-    logging.info("  - Transformed lesson file button")
+    log(logging.INFO, "  - Transformed lesson file button")
 
     return rubric, body
 
 
-def process_assignment_file(
-    md_path: Path,
-    course_root: Path,
+@dataclass
+class AssignmentBundle:
+    """In-memory result of the compute phase for one assignment file."""
+    md_path: Path
+    folder_name: str
+    index_text: str = ""
+    rubric: Optional[dict] = None
+    media_paths: List[str] = field(default_factory=list)
+    # (level, formatted message) pairs, replayed in order by the commit phase
+    notes: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def prepare_assignment(md_path: Path) -> Optional[AssignmentBundle]:
+    """
+    Compute phase for a single assignment markdown file.
+
+    Pure with respect to the destination tree: parses, transforms and collects
+    media references in memory so it can run in a worker process. Log output is
+    captured into the bundle rather than emitted, keeping per-assignment logs
+    grouped under their fence.
+    """
+    parsed = parse_assignment_filename(md_path.name)
+    if not parsed:
+        return None
+
+    module_num, order_num, base_name = parsed
+    bundle = AssignmentBundle(
+        md_path=md_path,
+        folder_name=build_assignment_folder_name(module_num, order_num, base_name),
+    )
+
+    def log(level: int, msg: str, *args) -> None:
+        bundle.notes.append((level, msg % args if args else msg))
+
+    original_metadata, content = load_markdown_with_frontmatter(md_path, log)
+    if not content:
+        log(logging.ERROR, "No content loaded for %s; skipping", md_path)
+        return bundle
+
+    bundle.rubric, content = transform_assignment_content(content, log)
+    bundle.index_text = build_index_text(
+        module_num=module_num,
+        order_num=order_num,
+        base_name=base_name,
+        original_metadata=original_metadata,
+        original_content=content,
+    )
+    bundle.media_paths = find_media_paths(content)
+    return bundle
+
+
+def commit_assignment(
+    bundle: AssignmentBundle,
     dest_root: Path,
-    topics_root: Optional[Path],
     course_id: str,
     resolver: MediaResolver,
 ) -> None:
     """
-    Process a single assignment markdown file.
+    Commit phase for a single assignment: write files and resolve media.
+
+    Runs serially in the main process, since MediaResolver carries
+    cross-assignment de-duplication state.
     """
+    md_path = bundle.md_path
     start_label = f"START: {course_id}/{md_path.name}"
     fence(start_label)
 
     logging.debug("Processing assignment: %s/%s", course_id, md_path.name)
 
-    parsed = parse_assignment_filename(md_path.name)
-    if not parsed:
-        logging.debug("Skipping file (does not match pattern): %s", md_path)
+    for level, message in bundle.notes:
+        logging.log(level, "%s", message)
+    if not bundle.index_text:
         return
 
-    module_num, order_num, base_name = parsed
-    assignment_folder_name = build_assignment_folder_name(
-        module_num, order_num, base_name
-    )
-
     dest_course_dir = dest_root / course_id
     dest_pages_dir = dest_course_dir / "pages"
     dest_pages_dir.mkdir(parents=True, exist_ok=True)
-    dest_course_dir.mkdir(parents=True, exist_ok=True)
-
-    dest_assignment_dir = dest_pages_dir / assignment_folder_name
-
-    original_metadata, content = load_markdown_with_frontmatter(md_path)
-    if not content:
-        logging.error("No content loaded for %s; skipping", md_path)
-        return
 
-    rubric, content = transform_assignment_content(content)
+    dest_assignment_dir = dest_pages_dir / bundle.folder_name
 
     # Create index.md (ensures dest_assignment_dir exists)
-    create_index_md(
-        dest_assignment_dir=dest_assignment_dir,
-        module_num=module_num,
-        order_num=order_num,
-        base_name=base_name,
-        original_metadata=original_metadata,
-        original_content=content,
-    )
+    create_index_md(dest_assignment_dir, bundle.index_text)
 
     # If a rubric was found, write rubric-draft.yaml in this assignment folder
-    if rubric:
+    if bundle.rubric:
         rubric_path = dest_assignment_dir / "rubric-draft.yaml"
-        rubric_path.parent.mkdir(parents=True, exist_ok=True)
         with rubric_path.open("w", encoding="utf-8") as rf:
-            yaml.safe_dump(rubric, rf, sort_keys=False, allow_unicode=True)
+            yaml.dump(
+                bundle.rubric,
+                rf,
+                Dumper=YamlSafeDumper,
+                sort_keys=False,
+                allow_unicode=True,
+            )
         logging.info("  - Wrote rubric-draft.yaml")
 
-    media_paths = find_media_paths(content)
+    media_paths = bundle.media_paths
     if media_paths:
         logging.debug(
             "Found %d potential media references in %s", len(media_paths), md_path
@@ -898,10 +1222,16 @@ def process_templates_dir(
     dest_root: Path,
     topics_root: Optional[Path],
     course_id: str,
+    pool: Optional[Executor] = None,
+    probe_cache: Optional[dict[Path, tuple[Path, bool]]] = None,
 ) -> list[tuple[Path, Path]]:
     """
     Process all matching .md files in a templates/ directory.
     Returns the list of missing media pairs (source_file, unresolved_path) for this course.
+
+    pool, when given, is a shared process pool for the compute phase;
+    otherwise one is started for this course. probe_cache is handed to the
+    course's MediaResolver so media probes are shared across courses.
     """
     logging.info("Processing course: %s", course_id)
 
@@ -911,39 +1241,75 @@ def process_templates_dir(
         topics_root=topics_root,
         course_id=course_id,
         dest_course_dir=dest_course_dir,
+        probe_cache=probe_cache,
     )
 
-    for entry in sorted(templates_dir.iterdir()):
+    with os.scandir(templates_dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+
+    # Hot per-entry loop: bind lookups locally, skip debug calls unless enabled
+    match_assignment = ASSIGNMENT_FILE_PATTERN.match
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    md_files: List[Path] = []
+    for entry in entries:
         if not entry.is_file():
             continue
-        if entry.suffix.lower() != ".md":
-            logging.debug("Skipping non-markdown file: %s", entry)
+        name = entry.name
+        if name[-3:].lower() != ".md":
+            if debug:
+                logging.debug("Skipping non-markdown file: %s", entry.path)
             continue
 
-        if not ASSIGNMENT_FILE_PATTERN.match(entry.name):
-            logging.debug("Skipping markdown (pattern mismatch): %s", entry)
+        if not match_assignment(name):
+            if debug:
+                logging.debug("Skipping markdown (pattern mismatch): %s", entry.path)
             continue
 
-        process_assignment_file(
-            md_path=entry,
-            course_root=course_root,
-            dest_root=dest_root,
-            topics_root=topics_root,
-            course_id=course_id,
-            resolver=resolver,
-        )
+        md_files.append(templates_dir / name)
+
+    # Compute phase fans out across processes; commit phase stays serial and
+    # in filename order so MediaResolver's de-dup decisions are deterministic.
+    workers = min(ASSIGNMENT_WORKERS, len(md_files))
+    if workers > 1 and pool is not None:
+        for bundle in pool.map(
+            prepare_assignment, md_files, chunksize=ASSIGNMENT_CHUNKSIZE
+        ):
+            if bundle:
+                commit_assignment(bundle, dest_root, course_id, resolver)
+    elif workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as course_pool:
+            for bundle in course_pool.map(
+                prepare_assignment, md_files, chunksize=ASSIGNMENT_CHUNKSIZE
+            ):
+                if bundle:
+                    commit_assignment(bundle, dest_root, course_id, resolver)
+    else:
+        for md_path in md_files:
+            bundle = prepare_assignment(md_path)
+            if bundle:
+                commit_assignment(bundle, dest_root, course_id, resolver)
 
     logging.info(" Course complete: %s", course_id)
     return resolver.missing_media
 
 
 def walk_course_root(
-    course_root: Path, dest_root: Path, topics_root: Optional[Path]
+    course_root: Path,
+    dest_root: Path,
+    topics_root: Optional[Path],
+    jobs: int = 1,
 ) -> dict[str, list[tuple[Path, Path]]]:
     r"""
     Walk the course root directory, but only enter course directories that match
     the pattern ^\d{2}-.+ and process their templates/ subdirectory if present.
 
+    With jobs > 1, up to that many courses are processed at once on threads.
+    Each course keeps its own MediaResolver, so no de-dup state is shared.
+    Log lines and progress output from concurrent courses interleave.
+    All courses, serial or not, share one process pool for the
+    per-assignment compute phase.
+
     Returns a mapping: course_id -> list of (source_file, unresolved_path).
     """
     logging.info("Scanning course root: %s", course_root)
@@ -953,32 +1319,70 @@ def walk_course_root(
         return {}
 
     missing_media_by_course: dict[str, list[tuple[Path, Path]]] = defaultdict(list)
+    # Shared by every course's MediaResolver; topics/ assets recur across courses
+    probe_cache: dict[Path, tuple[Path, bool]] = {}
+
+    with os.scandir(course_root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+
+    # With jobs > 1, (course_id, templates_dir) queued in name order
+    courses: List[Tuple[str, Path]] = []
+    # One process pool for every course; workers only start on first submit,
+    # so runs where no course has more than one template never spawn any
+    with ProcessPoolExecutor(max_workers=ASSIGNMENT_WORKERS) as pool:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
 
-    for entry in sorted(course_root.iterdir()):
-        if not entry.is_dir():
-            continue
+            if not is_course_dir(entry):
+                logging.debug(" Skipping non-course directory: %s", entry.path)
+                continue
 
-        if not is_course_dir(entry):
-            logging.debug(" Skipping non-course directory: %s", entry)
-            continue
+            logging.debug(" Found course directory: %s", entry.path)
 
-        logging.debug(" Found course directory: %s", entry)
+            templates_dir = course_root / entry.name / "templates"
+            if not os.path.isdir(templates_dir):
+                logging.warning(" No templates/ directory in %s; skipping", entry.path)
+                continue
 
-        templates_dir = entry / "templates"
-        if not templates_dir.is_dir():
-            logging.warning(" No templates/ directory in %s; skipping", entry)
-            continue
+            if jobs > 1:
+                courses.append((entry.name, templates_dir))
+                continue
 
-        course_id = entry.name
-        course_missing = process_templates_dir(
-            templates_dir=templates_dir,
-            course_root=course_root,
-            dest_root=dest_root,
-            topics_root=topics_root,
-            course_id=course_id,
-        )
-        if course_missing:
-            missing_media_by_course[course_id].extend(course_missing)
+            course_id = entry.name
+            course_missing = process_templates_dir(
+                templates_dir=templates_dir,
+                course_root=course_root,
+                dest_root=dest_root,
+                topics_root=topics_root,
+                course_id=course_id,
+                pool=pool,
+                probe_cache=probe_cache,
+            )
+            if course_missing:
+                missing_media_by_course[course_id].extend(course_missing)
+
+        if not courses:
+            return missing_media_by_course
+
+        with ThreadPoolExecutor(max_workers=min(jobs, len(courses))) as course_threads:
+            futures = {
+                course_threads.submit(
+                    process_templates_dir,
+                    templates_dir=templates_dir,
+                    course_root=course_root,
+                    dest_root=dest_root,
+                    topics_root=topics_root,
+                    course_id=course_id,
+                    pool=pool,
+                    probe_cache=probe_cache,
+                ): course_id
+                for course_id, templates_dir in courses
+            }
+            for future in as_completed(futures):
+                course_missing = future.result()
+                if course_missing:
+                    missing_media_by_course[futures[future]].extend(course_missing)
 
     return missing_media_by_course
 
@@ -1009,6 +1413,16 @@ def parse_args() -> argparse.Namespace:
         required=False,
         help="Optional path to shared topics/media directory",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help=(
+            "Number of course directories to process in parallel (default: 1); "
+            "log output from concurrent courses interleaves"
+        ),
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -1019,36 +1433,49 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+@functools.lru_cache(maxsize=4096)
+def _quote_str(s: str) -> str:
+    s = s.replace('"', r'\"')
+    return f'"{s}"'
+
+
 def _quote_path_for_shell(p: Path) -> str:
     """
     Return a shell-friendly, single-argument representation of a path.
     Uses simple double-quoting; good enough for typical POSIX shells.
+    Source files repeat across report lines, so quoting is memoized.
     """
-    s = str(p)
-    s = s.replace('"', r'\"')
-    return f'"{s}"'
+    return _quote_str(str(p))
 
 
-def run(course_root: Path, dest_root: Path, topics_root: Optional[Path]) -> None:
+def run(
+    course_root: Path,
+    dest_root: Path,
+    topics_root: Optional[Path],
+    jobs: int = 1,
+) -> None:
     dest_root.mkdir(parents=True, exist_ok=True)
 
     missing_media_by_course = walk_course_root(
         course_root=course_root,
         dest_root=dest_root,
         topics_root=topics_root,
+        jobs=jobs,
     )
 
     # After all processing, write a missing-media report if needed
     if missing_media_by_course:
         report_path = dest_root / "missing-media.txt"
-        with report_path.open("w", encoding="utf-8") as f:
-            for course_id, items in sorted(missing_media_by_course.items()):
-                f.write(f"# Course: {course_id}\n")
-                for source_file, resolved_path in items:
-                    missing = _quote_path_for_shell(resolved_path)
-                    src = _quote_path_for_shell(source_file)
-                    f.write(f"{missing}  # from {src}\n")
-                f.write("\n")
+        # Format every line first, then hand the report to one write
+        parts: List[str] = []
+        for course_id, items in sorted(missing_media_by_course.items()):
+            parts.append(f"# Course: {course_id}\n")
+            for source_file, resolved_path in items:
+                missing = _quote_path_for_shell(resolved_path)
+                src = _quote_path_for_shell(source_file)
+                parts.append(f"{missing}  # from {src}\n")
+            parts.append("\n")
+        report_path.write_text("".join(parts), encoding="utf-8")
         logging.info("Wrote missing media report to %s", report_path)
     else:
         logging.info(" No missing media references detected.")
@@ -1069,7 +1496,12 @@ def main() -> None:
     if topics_root:
         logging.info("Topics/media directory: %s", topics_root)
 
-    run(course_root=course_root, dest_root=dest_root, topics_root=topics_root)
+    run(
+        course_root=course_root,
+        dest_root=dest_root,
+        topics_root=topics_root,
+        jobs=args.jobs,
+    )
 
 
 if __name__ == "__main__":
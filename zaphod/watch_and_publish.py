@@ -88,10 +88,10 @@ def find_python_executable() -> str:
 
 
 def fence(label: str):
-    ts = datetime.now().strftime("%H:%M:%S")
+    ts = time.strftime("%H:%M:%S")
     print(DOT_LINE)
     print(f"[{ts}] {label}")
-    print("\n")  # blank line after each phase
+    print()  # blank line after each phase
 
 
 def _truthy_env(name: str) -> bool: